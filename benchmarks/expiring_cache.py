@@ -0,0 +1,68 @@
+"""Compares utils.cache.ExpiringCache against the implementation it replaced.
+
+Run from the repository root:
+
+    python -m benchmarks.expiring_cache
+"""
+
+from __future__ import annotations
+
+import time
+import timeit
+from typing import Any
+
+from utils.cache import ExpiringCache
+
+
+class OldExpiringCache(dict):
+    # the previous implementation, scans every entry on each read
+    def __init__(self, seconds: float):
+        self.__ttl: float = seconds
+        super().__init__()
+
+    def __verify_cache_integrity(self):
+        current_time = time.monotonic()
+        to_remove = [
+            k for (k, (v, t)) in self.items() if current_time > (t + self.__ttl)
+        ]
+        for k in to_remove:
+            del self[k]
+
+    def __contains__(self, key: str):
+        self.__verify_cache_integrity()
+        return super().__contains__(key)
+
+    def __getitem__(self, key: str):
+        self.__verify_cache_integrity()
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: str, value: Any):
+        super().__setitem__(key, (value, time.monotonic()))
+
+
+def bench(cls: type, size: int, reads: int) -> float:
+    cache = cls(3600.0)
+    keys = [f"key:{n}" for n in range(size)]
+    for key in keys:
+        cache[key] = key
+
+    def run():
+        for n in range(reads):
+            cache[keys[n % size]]
+
+    return min(timeit.repeat(run, number=1, repeat=3)) / reads
+
+
+def main():
+    reads = 2_000
+    print(f"{'entries':>8} {'old':>12} {'new':>12} {'speedup':>8}")
+    for size in (10, 100, 1_000, 10_000):
+        old = bench(OldExpiringCache, size, reads)
+        new = bench(ExpiringCache, size, reads)
+        print(
+            f"{size:>8,} {old * 1e6:>10.2f}us {new * 1e6:>10.2f}us {old / new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Compares utils.functions.resize_to_limit against the halving loop it replaced.
+
+Run from the repository root with some images and a byte limit:
+
+    python -m benchmarks.resize avatar.gif banner.png --limit 2097152
+
+Without any images a noisy PNG and GIF are generated. Every run happens in
+its own process so peak RSS isn't inflated by the runs before it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from io import BytesIO
+from typing import List, Tuple
+
+from PIL import Image, ImageSequence
+
+from utils.functions import resize_to_limit
+
+
+def old_resize_to_limit(data: BytesIO, limit: int) -> BytesIO:
+    # the previous implementation, halves and re-encodes until it fits
+    current_size = data.getbuffer().nbytes
+    while current_size > limit:
+        with Image.open(data) as im:
+            data = BytesIO()
+            if im.format == "PNG":
+                im = im.resize(tuple([i // 2 for i in im.size]), resample=Image.BICUBIC)  # type: ignore
+                im.save(data, "png")
+            elif im.format == "GIF":
+                durations = []
+                new_frames = []
+                for frame in ImageSequence.Iterator(im):
+                    durations.append(frame.info["duration"])
+                    new_frames.append(
+                        frame.resize([i // 2 for i in im.size], resample=Image.BICUBIC)  # type: ignore
+                    )
+                new_frames[0].save(
+                    data,
+                    save_all=True,
+                    append_images=new_frames[1:],
+                    format="gif",
+                    version=im.info["version"],
+                    duration=durations,
+                    loop=0,
+                    transparency=0,
+                    background=im.info["background"],
+                    palette=im.getpalette(),
+                )
+            data.seek(0)
+            current_size = data.getbuffer().nbytes
+    return data
+
+
+def noise_png(size: int) -> bytes:
+    buffer = BytesIO()
+    Image.frombytes("RGB", (size, size), os.urandom(size * size * 3)).save(
+        buffer, "png"
+    )
+    return buffer.getvalue()
+
+
+def noise_gif(size: int, frames: int) -> bytes:
+    images = [
+        Image.frombytes("L", (size, size), os.urandom(size * size)).convert("P")
+        for _ in range(frames)
+    ]
+    buffer = BytesIO()
+    images[0].save(
+        buffer, "gif", save_all=True, append_images=images[1:], duration=40, loop=0
+    )
+    return buffer.getvalue()
+
+
+def reset_peak_rss():
+    # importing the bot's modules peaks higher than resizing one image does,
+    # linux can reset the high water mark so only the resize is measured
+    try:
+        with open("/proc/self/clear_refs", "w") as fp:
+            fp.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss() -> int:
+    # KiB
+    try:
+        with open("/proc/self/status") as fp:
+            for line in fp:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run(which: str, path: str, limit: int) -> Tuple[float, int, int, Tuple[int, int]]:
+    func = old_resize_to_limit if which == "old" else resize_to_limit
+    with open(path, "rb") as fp:
+        data = fp.read()
+    reset_peak_rss()
+    baseline = peak_rss()
+    start = time.perf_counter()
+    result = func(BytesIO(data), limit)
+    elapsed = time.perf_counter() - start
+    size = result.seek(0, os.SEEK_END)
+    result.seek(0)
+    with Image.open(result) as im:
+        dimensions = im.size
+    return elapsed, peak_rss() - baseline, size, dimensions
+
+
+def main(paths: List[str], limit: int):
+    images = [(path, open(path, "rb").read()) for path in paths]
+    if not images:
+        images = [
+            ("noise.png", noise_png(2048)),
+            ("noise.gif", noise_gif(512, 60)),
+        ]
+
+    ctx = multiprocessing.get_context("spawn")
+    for name, data in images:
+        # 40% of the original unless a limit was given
+        target = limit or int(len(data) * 0.4)
+        print(f"{name}: {len(data) / 1024:,.1f}KiB, limit {target / 1024:,.1f}KiB")
+
+        # the workers read the image themselves, sending it over would count
+        # the pickled copy towards their peak
+        with tempfile.NamedTemporaryFile() as fp:
+            fp.write(data)
+            fp.flush()
+            for which in ("old", "new"):
+                with ctx.Pool(1) as pool:
+                    elapsed, rss, size, dimensions = pool.apply(
+                        run, (which, fp.name, target)
+                    )
+                print(
+                    f"  {which}  {elapsed * 1000:>10,.1f}ms  peak RSS +{rss / 1024:>8,.1f}MiB  "
+                    f"{size / 1024:>10,.1f}KiB  {dimensions[0]}x{dimensions[1]}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--limit", type=int, default=0)
+    parsed = parser.parse_args()
+    main(parsed.paths, parsed.limit)
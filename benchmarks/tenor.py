@@ -0,0 +1,87 @@
+"""Compares TenorResolver's page scanning against the BeautifulSoup parse it replaced.
+
+Save some tenor pages (``curl -o page.html https://tenor.com/view/...``) and
+run from the repository root:
+
+    python -m benchmarks.tenor page.html other.html
+
+Without any pages a synthetic one shaped like tenor's is used. Needs
+beautifulsoup4 installed, the bot itself no longer does.
+"""
+
+from __future__ import annotations
+
+import random
+import string
+import sys
+import timeit
+from typing import List, Optional, Tuple
+
+import bs4
+
+from utils.tenor import CONTAINER_MARKER, IMG_SRC_RE, find_tenor_media
+
+
+def old_get_url(text: str) -> Optional[str]:
+    # what TenorUrlConverter.get_url used to do, in a thread
+    scraper = bs4.BeautifulSoup(text, "html.parser")
+    container = scraper.find(id="single-gif-container")
+    if not container:
+        return None
+
+    element = container.find("div").find("div").find("img")  # type: ignore
+    if element is None:
+        return None
+
+    return element["src"].replace("AAAAd", "AAAAC")  # type: ignore
+
+
+def synthetic_page() -> Tuple[str, str]:
+    def filler(n: int) -> str:
+        words = ("".join(random.choices(string.ascii_lowercase, k=8)) for _ in range(n))
+        return "".join(f'<div class="x"><a href="/{w}">{w}</a></div>' for w in words)
+
+    page = (
+        "<html><head><script>"
+        + "var x = 1;" * 20_000
+        + "</script></head><body>"
+        + filler(2_000)
+        + '<div id="single-gif-container"><div class="Gif"><div>'
+        + '<img src="https://media.tenor.com/abcdefAAAAd/cat.gif" alt="cat">'
+        + "</div></div></div>"
+        + filler(10_000)
+        + "</body></html>"
+    )
+    return "synthetic", page
+
+
+def bytes_needed(page: str) -> int:
+    container = page.find(CONTAINER_MARKER)
+    match = IMG_SRC_RE.search(page, container)
+    return len(page[: match.end()].encode()) if match else len(page.encode())
+
+
+def main(paths: List[str]):
+    pages = [(path, open(path, encoding="utf-8").read()) for path in paths]
+    if not pages:
+        pages = [synthetic_page()]
+
+    for name, page in pages:
+        old = old_get_url(page)
+        new = find_tenor_media(page)
+        old_time = min(timeit.repeat(lambda: old_get_url(page), number=5, repeat=3)) / 5
+        new_time = (
+            min(timeit.repeat(lambda: find_tenor_media(page), number=50, repeat=3)) / 50
+        )
+
+        size = len(page.encode())
+        print(f"{name}: {size / 1024:,.1f}KiB, same result: {old == new}")
+        print(f"  bs4 html.parser {old_time * 1000:>10.2f}ms")
+        print(f"  scan            {new_time * 1000:>10.2f}ms")
+        print(
+            f"  streamed        {bytes_needed(page) / 1024:>10,.1f}KiB read before stopping"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,20 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import datetime
 import pkgutil
 import re
 import sys
+import time
 import traceback
 from io import StringIO
 from logging import Logger
 from typing import (
     TYPE_CHECKING,
     Any,
+    Coroutine,
     Dict,
     List,
     Mapping,
     Optional,
-    Tuple,
     Type,
     TypeVar,
     Union,
@@ -28,7 +30,29 @@ from discord.abc import Messageable
 from discord.ext import commands
 from redis import asyncio as aioredis
 
-from utils import MESSAGE_RE, Config, EmojiInputType, Emojis, update_pokemon
+from utils import (
+    BLOB_ROOT,
+    MESSAGE_RE,
+    BlobStore,
+    BulkExecutor,
+    Config,
+    EmojiInputType,
+    Emojis,
+    GoogleKeyScheduler,
+    HTTPCache,
+    ImageEngine,
+    ImageIndex,
+    LocalBlobBackend,
+    SpotifyClient,
+    TenorResolver,
+    ThumbnailCache,
+    TwemojiRenderer,
+    UserSettings,
+    WebhookPool,
+    cache,
+    read_pokemon_snapshot,
+    update_pokemon,
+)
 
 if TYPE_CHECKING:
     from extensions.context import Context
@@ -65,7 +89,6 @@ async def get_prefix(bot: Fishie, message: discord.Message) -> List[str]:
 class Fishie(commands.Bot):
     redis: aioredis.Redis[Any]
     custom_emojis = Emojis()
-    cached_covers: Dict[str, Tuple[str, bool]] = {}
     pokemon: List[str]
     error_logs: discord.Webhook
 
@@ -81,13 +104,28 @@ class Fishie(commands.Bot):
         self.logger: Logger = logger
         self.pool = pool
         self.session = session
+        self.http_cache = HTTPCache(session)
         self.start_time: datetime.datetime
         self.context_cls: Type[commands.Context[Fishie]] = commands.Context
         self._extensions = [
             m.name for m in pkgutil.iter_modules(["./extensions"], prefix="extensions.")
         ]
-        self.spotify_key: Optional[str] = None
-        self.cached_covers: Dict[str, Tuple[str, bool]] = {}
+        self.spotify = SpotifyClient(self)
+        self.google_keys = GoogleKeyScheduler(self, config["keys"]["google"])
+        self.twemoji = TwemojiRenderer(self)
+        self.tenor = TenorResolver(self)
+        self.images = ImageEngine()
+        self.thumbnails = ThumbnailCache(self)
+        self.image_index = ImageIndex(self)
+        self.bulk = BulkExecutor(self)
+        self.image_webhooks = WebhookPool(session, config["webhooks"]["images"])
+        self.blobs = BlobStore(
+            LocalBlobBackend(config.get("blobs", {}).get("path", BLOB_ROOT))
+        )
+        self.pokemon = []
+        self.user_settings = UserSettings(
+            self, maxsize=config.get("cache", {}).get("user_settings", 10_000)
+        )
         self.testing: bool = testing
         self.current_downloads: List[str] = []
         self.dagpi_rl = commands.CooldownMapping.from_cooldown(
@@ -98,6 +136,12 @@ class Fishie(commands.Bot):
         )  # {repr(ctx): message(from ctx.send) }
         self.support_invite: str = f"https://discord.gg/Fct5UGadcb"
 
+        # startup timings, in seconds
+        self.extension_load_times: Dict[str, float] = {}
+        self.cog_load_times: Dict[str, float] = {}
+        self.warmup_times: Dict[str, float] = {}
+        self.warmups: Dict[str, asyncio.Task[Any]] = {}
+
         super().__init__(
             command_prefix=get_prefix,
             intents=discord.Intents.all(),
@@ -165,15 +209,68 @@ class Fishie(commands.Bot):
 
         return await super().on_error(event, *args, **kwargs)
 
+    async def _load_extension_timed(self, ext: str):
+        start = time.perf_counter()
+        try:
+            await self.load_extension(ext)
+        except Exception as e:
+            self.logger.warn(f"Failed to load extension: {ext}")
+            self.logger.warn(f"{e.__class__.__name__}: {str(e)}")
+            return
+
+        elapsed = self.extension_load_times[ext] = time.perf_counter() - start
+        self.logger.info(f"Loaded extension: {ext} ({elapsed * 1000:.2f}ms)")
+
     async def load_extensions(self):
-        for ext in self._extensions:
-            try:
-                await self.load_extension(ext)
-                self.logger.info(f"Loaded extension: {ext}")
-            except Exception as e:
-                self.logger.warn(f"Failed to load extension: {ext}")
-                self.logger.warn(f"{e.__class__.__name__}: {str(e)}")
-                continue
+        # extensions don't depend on each other so they can all load at once,
+        # anything slow in a cog_load should be a warmup instead
+        start = time.perf_counter()
+        await asyncio.gather(
+            *[self._load_extension_timed(ext) for ext in self._extensions]
+        )
+        self.logger.info(
+            f"Loaded {len(self.extensions)}/{len(self._extensions)} extensions in {(time.perf_counter() - start) * 1000:.2f}ms"
+        )
+
+    async def add_cog(
+        self, cog: commands.Cog, /, *, override: bool = False, **kwargs: Any
+    ) -> None:
+        start = time.perf_counter()
+        await super().add_cog(cog, override=override, **kwargs)
+        self.cog_load_times[cog.qualified_name] = time.perf_counter() - start
+
+    async def _run_warmup(self, name: str, coro: Coroutine[Any, Any, Any]):
+        start = time.perf_counter()
+        try:
+            await coro
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.warn(f"Warmup {name} failed")
+            self.logger.warn(f"{e.__class__.__name__}: {str(e)}")
+            return
+
+        elapsed = self.warmup_times[name] = time.perf_counter() - start
+        self.logger.info(f"Finished warmup: {name} ({elapsed * 1000:.2f}ms)")
+
+    def add_warmup(
+        self, name: str, coro: Coroutine[Any, Any, Any]
+    ) -> asyncio.Task[Any]:
+        """Runs slow startup work (network fetches etc) in the background.
+
+        Anything depending on it should call `wait_for_warmup` before use.
+        """
+        task = asyncio.create_task(self._run_warmup(name, coro), name=f"warmup:{name}")
+        self.warmups[name] = task
+        return task
+
+    async def wait_for_warmup(self, name: str):
+        task = self.warmups.get(name)
+        if task is None or task.done():
+            return
+
+        # shielded so a cancelled command doesn't cancel the warmup for everyone else
+        await asyncio.shield(task)
 
     async def unload_extensions(self):
         for ext in self._extensions:
@@ -199,15 +296,23 @@ class Fishie(commands.Bot):
         with open("schema.sql") as fp:
             await self.pool.execute(fp.read())
 
-        await self.load_extensions()
-        await self.populate_cache()
-        await update_pokemon(self)
-        self.logger.info(f"Added {len(self.pokemon):,} pokemon")
-
         self.error_logs = discord.Webhook.from_url(
             self.config["webhooks"]["error_logs"], session=self.session
         )
 
+        # the snapshot is used straight away, the refresh can take its time
+        snapshot = read_pokemon_snapshot()
+        if snapshot:
+            self.pokemon = snapshot["names"]
+            self.logger.info(f"Added {len(self.pokemon):,} pokemon from snapshot")
+
+        self.add_warmup("pokemon", update_pokemon(self, snapshot))
+        await self.user_settings.start()
+        self.spotify.start()
+        cache.set_redis(self.redis)
+        await self.load_extensions()
+        await self.populate_cache()
+
     async def on_ready(self):
         if not hasattr(self, "start_time"):
             self.start_time = discord.utils.utcnow()
@@ -248,6 +353,11 @@ class Fishie(commands.Bot):
 
     async def close(self) -> None:
         self.logger.info("Logging out")
+        for task in self.warmups.values():
+            task.cancel()
+        await self.user_settings.close()
+        self.spotify.close()
+        self.images.close()
         await self.unload_extensions()
         await self.close_sessions()
         await super().close()
@@ -309,11 +419,8 @@ class Fishie(commands.Bot):
         message: discord.Message,
         reactions: List[EmojiInputType | discord.Reaction],
     ):
-        for reaction in reactions:
-            try:
-                await message.add_reaction(reaction)
-            except:
-                pass
+        # one at a time so they show up in order, HTTP failures are ignored
+        await self.bulk.run(reactions, message.add_reaction, max_concurrency=1)
 
     @property
     def bot_permissions(self) -> discord.Permissions:
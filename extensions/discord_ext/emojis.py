@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, Any, List, Optional, Union
 
 import discord
 from discord.ext import commands
+from discord.http import Route
 
 from core import Cog
 from utils import EMOJI_RE, SimplePages, TwemojiConverter, human_join, plural, to_image
@@ -104,15 +105,31 @@ class Emojis(Cog):
 
         message = await ctx.send(f"Deleting {plural(len(emojis)):emoji}...")
 
-        deleted_emojis = []
-
-        for emoji in emojis:
-            deleted_emojis.append(f"`{emoji}`")
-            await emoji.delete()
+        async def progress(done: int, total: int):
             await message.edit(
-                content=f"Successfully deleted {human_join(deleted_emojis, final='and')} *({len(deleted_emojis)}/{len(emojis)})*."
+                content=f"Deleting {plural(total):emoji}... *({done}/{total})*"
             )
 
+        result = await ctx.bot.bulk.run(
+            emojis,
+            lambda emoji: emoji.delete(),
+            route=Route(
+                "DELETE",
+                "/guilds/{guild_id}/emojis/{emoji_id}",
+                guild_id=ctx.guild.id,
+                emoji_id=0,
+            ),
+            progress=progress,
+        )
+
+        deleted_emojis = [f"`{emoji}`" for emoji in result.succeeded]
+        content = f"Successfully deleted {human_join(deleted_emojis, final='and')} *({len(deleted_emojis)}/{len(emojis)})*."
+        if not deleted_emojis:
+            content = "Couldn't delete any emojis."
+        if result.failed:
+            content += f" Failed: {result.describe_failures()}"
+        await message.edit(content=content)
+
     @emoji_group.command(name="rename")
     @commands.has_permissions(manage_emojis=True)
     @commands.bot_has_permissions(manage_emojis=True)
@@ -47,6 +47,10 @@ class Pokemon(Cog):
         if str(message.guild.id) not in await self.bot.redis.smembers("poketwo_guilds"):
             return
 
+        if not self.bot.pokemon:
+            # no snapshot on disk yet, first boot
+            await self.bot.wait_for_warmup("pokemon")
+
         try:
             await message.channel.send("\n".join(self.auto_solve(message.content)))
         except commands.BadArgument:
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 import discord
 
 from core import Cog
+from utils import IngestQueue
 
 from .avatars import Avatars
 from .commands import Commands
@@ -23,6 +24,15 @@ class Logging(Avatars, Guild, User, Commands):
     def __init__(self, bot: Fishie):
         super().__init__()
         self.bot = bot
+        self.ingest = IngestQueue("logging")
+
+    async def cog_load(self) -> None:
+        self.ingest.start()
+
+    async def cog_unload(self) -> None:
+        self.ingest.close()
+        if self.blob_migration is not None:
+            self.blob_migration.cancel()
 
 
 async def setup(bot: Fishie):
@@ -1,58 +1,90 @@
 from __future__ import annotations
 
 import asyncio
-import random
-from io import BytesIO
-from typing import TYPE_CHECKING, Optional
+import functools
+import logging
+from typing import TYPE_CHECKING, Dict, Optional
 
+import aiohttp
 import asyncpg
 import discord
 from discord.ext import commands
 
 from core import Cog
-from utils import resize_to_limit
 
 if TYPE_CHECKING:
     from core import Fishie
     from extensions.context import Context
+    from utils import IngestQueue
+
+_log = logging.getLogger(__name__)
+
+# (table, old webhook URL column, blob digest column)
+BLOB_TABLES = (
+    ("avatars", "avatar", "avatar_hash"),
+    ("guild_avatars", "avatar", "avatar_hash"),
+    ("guild_icons", "icon", "icon_hash"),
+)
 
 
 class Avatars(Cog):
+    ingest: IngestQueue
+
+    def __init__(self):
+        super().__init__()
+        self.blob_migration: Optional[asyncio.Task[None]] = None
+        self.blob_migration_counts: Dict[str, int] = {"migrated": 0, "failed": 0}
+
+    async def mirror_avatar(
+        self,
+        user: discord.User | discord.Member,
+        asset: discord.Asset,
+        data: bytes,
+    ) -> Optional[str]:
+        """Uploads a copy to one of the image webhooks, returns its URL."""
+        image = await self.bot.images.downscale(data, 8388608)
+        return await self.bot.image_webhooks.upload(
+            f"{user.mention} | {user} | {user.id} | {discord.utils.format_dt(discord.utils.utcnow())}",
+            image.getvalue(),
+            f"{user.id}_{asset.key}.{['png', 'gif'][asset.is_animated()]}",
+        )
+
     async def add_avatar(
         self,
         user: discord.User | discord.Member,
         asset: discord.Asset,
         guild_id: Optional[int] = None,
     ):
-        webhook = discord.Webhook.from_url(
-            random.choice(self.bot.config["webhooks"]["images"]),
-            session=self.bot.session,
+        # already on record, nothing to download
+        exists = await self.bot.pool.fetchval(
+            (
+                "SELECT 1 FROM guild_avatars WHERE member_id = $1 AND avatar_key = $2 AND guild_id = $3"
+                if guild_id
+                else "SELECT 1 FROM avatars WHERE user_id = $1 AND avatar_key = $2"
+            ),
+            *((user.id, asset.key, guild_id) if guild_id else (user.id, asset.key)),
         )
-        try:
-            image = await asyncio.to_thread(
-                resize_to_limit, BytesIO(await asset.read()), 8388608
-            )
+        if exists:
+            return
 
-            message = await webhook.send(
-                f"{user.mention} | {user} | {user.id} | {discord.utils.format_dt(discord.utils.utcnow())}",
-                file=discord.File(
-                    image,
-                    filename=f"{user.id}_{asset.key}.{['png', 'gif'][asset.is_animated()]}",
-                ),
-                wait=True,
-                allowed_mentions=discord.AllowedMentions.none(),
-            )
+        try:
+            data = await asset.read()
         except discord.HTTPException as e:
             raise commands.BadArgument(str(e))
 
+        mirror = None
+        if self.bot.config.get("blobs", {}).get("mirror_to_webhooks"):
+            mirror = functools.partial(self.mirror_avatar, user, asset, data)
+        digest, url = await self.bot.image_index.store(data, mirror)
+
         sql = (
             """
-        INSERT INTO guild_avatars(member_id, guild_id, avatar_key, created_at, avatar)
-        VALUES($1, $2, $3, $4, $5)"""
+        INSERT INTO guild_avatars(member_id, guild_id, avatar_key, created_at, avatar, avatar_hash)
+        VALUES($1, $2, $3, $4, $5, $6)"""
             if guild_id
             else """
-        INSERT INTO avatars(user_id, avatar_key, created_at, avatar)
-        VALUES($1, $2, $3, $4)
+        INSERT INTO avatars(user_id, avatar_key, created_at, avatar, avatar_hash)
+        VALUES($1, $2, $3, $4, $5)
         """
         )
         args = (
@@ -61,14 +93,16 @@ class Avatars(Cog):
                 guild_id,
                 asset.key,
                 discord.utils.utcnow(),
-                message.attachments[0].url,
+                url,
+                digest,
             )
             if guild_id
             else (
                 user.id,
                 asset.key,
                 discord.utils.utcnow(),
-                message.attachments[0].url,
+                url,
+                digest,
             )
         )
 
@@ -77,6 +111,63 @@ class Avatars(Cog):
         except asyncpg.UniqueViolationError:
             pass
 
+    async def _fetch_legacy(self, url: str) -> Optional[bytes]:
+        try:
+            async with self.bot.session.get(url) as resp:
+                if resp.status != 200:
+                    return None
+                return await resp.read()
+        except aiohttp.ClientError:
+            return None
+
+    async def migrate_to_blobs(self, *, batch_size: int = 25, delay: float = 2.0):
+        """Copies images only stored as webhook attachments into the blob store.
+
+        Runs through each table once, ``batch_size`` downloads at a time with
+        ``delay`` seconds between batches. URLs that have already expired are
+        counted as failed and left alone.
+        """
+        counts = self.blob_migration_counts
+        for table, url_column, hash_column in BLOB_TABLES:
+            last_id = 0
+            while True:
+                rows = await self.bot.pool.fetch(
+                    f"""SELECT id, {url_column} AS url FROM {table}
+                    WHERE {hash_column} IS NULL AND {url_column} IS NOT NULL AND id > $1
+                    ORDER BY id LIMIT $2""",
+                    last_id,
+                    batch_size,
+                )
+                if not rows:
+                    break
+
+                last_id = rows[-1]["id"]
+                images = await asyncio.gather(
+                    *[self._fetch_legacy(row["url"]) for row in rows]
+                )
+
+                updates = []
+                for row, data in zip(rows, images):
+                    if data is None:
+                        counts["failed"] += 1
+                        continue
+                    digest = await self.bot.blobs.put(data)
+                    # the old URL expires, it isn't worth handing out again
+                    await self.bot.image_index.add(digest)
+                    updates.append((digest, row["id"]))
+
+                if updates:
+                    await self.bot.pool.executemany(
+                        f"UPDATE {table} SET {hash_column} = $1 WHERE id = $2", updates
+                    )
+                    counts["migrated"] += len(updates)
+
+                await asyncio.sleep(delay)
+
+        _log.info(
+            f"Blob migration done, {counts['migrated']:,} migrated, {counts['failed']:,} failed"
+        )
+
     @commands.Cog.listener("on_user_update")
     async def user_update(self, before_u: discord.User, after_u: discord.User):
         if before_u.display_avatar.key == after_u.display_avatar.key:
@@ -85,7 +176,7 @@ class Avatars(Cog):
         if "avatar" in await self.bot.redis.smembers(f"opted_out:{after_u.id}"):
             return
 
-        await self.add_avatar(after_u, after_u.display_avatar)
+        self.ingest.submit(self.add_avatar, after_u, after_u.display_avatar)
 
     @commands.Cog.listener("on_member_update")
     async def member_update(self, before_m: discord.Member, after_m: discord.Member):
@@ -98,4 +189,6 @@ class Avatars(Cog):
         if "avatar" in await self.bot.redis.smembers(f"opted_out:{after_m.id}"):
             return
 
-        await self.add_avatar(before_m, after_m.display_avatar, after_m.guild.id)
+        self.ingest.submit(
+            self.add_avatar, before_m, after_m.display_avatar, after_m.guild.id
+        )
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import base64
 import datetime
 import random
@@ -15,10 +14,9 @@ from utils import (
     AvatarsPageSource,
     FieldPageSource,
     Pager,
-    format_bytes,
     format_status,
+    grid_cell_size,
     human_timedelta,
-    to_image,
 )
 
 if TYPE_CHECKING:
@@ -46,16 +44,19 @@ class Commands(Cog):
             if not bool(records):
                 raise commands.BadArgument(f"I have no avatars on record for {user}")
 
-            entries: List[Tuple[str, datetime.datetime, int]] = [
+            entries: List[
+                Tuple[Optional[str], datetime.datetime, int, Optional[str]]
+            ] = [
                 (
                     r["avatar"],
                     r["created_at"],
                     r["id"],
+                    r["avatar_hash"],
                 )
                 for r in records
             ]
 
-            source = AvatarsPageSource(entries=entries)
+            source = AvatarsPageSource(entries=entries, blobs=self.bot.blobs)
             source.embed.color = (
                 self.bot.embedcolor
                 if user.color == discord.Color.default()
@@ -91,13 +92,25 @@ class Commands(Cog):
             if not bool(records):
                 raise commands.BadArgument(f"{user} has no avatars on record.")
 
-            avatars = await asyncio.gather(
-                *[to_image(ctx.session, row["avatar"], bytes=True) for row in records]
+            avatars = await self.bot.thumbnails.get_many(
+                [
+                    (
+                        f"{row[user_id]}_{row['avatar_key']}",
+                        row["avatar_hash"],
+                        row["avatar"],
+                    )
+                    for row in records
+                ],
+                grid_cell_size(len(records)),
             )
+            if not any(avatars):
+                raise commands.BadArgument(
+                    f"I couldn't download any of {user}'s avatars."
+                )
 
             file = discord.File(
-                await format_bytes(
-                    ctx.guild.filesize_limit if ctx.guild else 8388608, avatars  # type: ignore
+                await self.bot.images.grid(
+                    avatars, ctx.guild.filesize_limit if ctx.guild else 8388608
                 ),
                 f"{user.id}_avatar_history.png",
             )
@@ -145,18 +158,18 @@ class Commands(Cog):
         self, ctx: Context, *, user: discord.User = commands.Author
     ):
         """Shows a user's previous avatars in a grid view"""
-        await ctx.send(
-            "Due to a recent discord update this command is broken, please use 'fish avatars' in the meantime"
-        )
+        await self.avatars_grid(ctx, user)
 
     @avatar_history.command(name="server", aliases=("guild", "s"))
+    @commands.guild_only()
     async def server_avatar_history(
         self, ctx: Context, *, user: discord.User = commands.Author
     ):
-        """Shows a user's previous avatars in a grid view"""
-        await ctx.send(
-            "Due to a recent discord update this command is broken, please use 'fish avatars' in the meantime"
-        )
+        """Shows a user's previous server avatars in a grid view"""
+        if ctx.guild is None:
+            return  # wont happen
+
+        await self.avatars_grid(ctx, user, ctx.guild.id)
 
     @commands.command(name="usernames")
     async def usernames(self, ctx: Context, *, user: discord.User = commands.Author):
@@ -315,16 +328,19 @@ class Commands(Cog):
             if not bool(records):
                 raise commands.BadArgument(f"I have no icons on record for {guild}")
 
-            entries: List[Tuple[str, datetime.datetime, int]] = [
+            entries: List[
+                Tuple[Optional[str], datetime.datetime, int, Optional[str]]
+            ] = [
                 (
                     r["icon"],
                     r["created_at"],
                     r["id"],
+                    r["icon_hash"],
                 )
                 for r in records
             ]
 
-            source = AvatarsPageSource(entries=entries)
+            source = AvatarsPageSource(entries=entries, blobs=self.bot.blobs)
             source.embed.color = self.bot.embedcolor
             source.embed.title = f"Icons for {guild}"
             pager = Pager(source, ctx=ctx)
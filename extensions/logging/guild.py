@@ -1,48 +1,61 @@
 from __future__ import annotations
 
-import asyncio
 import base64
-import random
-from io import BytesIO
-from typing import TYPE_CHECKING
+import functools
+from typing import TYPE_CHECKING, Optional
 
 import asyncpg
 import discord
 from discord.ext import commands
 
 from core import Cog
-from utils import resize_to_limit
 
 if TYPE_CHECKING:
     from core import Fishie
+    from utils import IngestQueue
 
 
 class Guild(Cog):
+    ingest: IngestQueue
+
+    async def mirror_icon(
+        self, guild: discord.Guild, asset: discord.Asset, data: bytes
+    ) -> Optional[str]:
+        """Uploads a copy to one of the image webhooks, returns its URL."""
+        image = await self.bot.images.downscale(data, 8388608)
+        return await self.bot.image_webhooks.upload(
+            f"{guild.name} | {guild.id} | {guild.member_count:,} | {discord.utils.format_dt(discord.utils.utcnow())}",
+            image.getvalue(),
+            f"{guild.id}_{asset.key}.png",
+        )
+
     async def add_icon(
         self,
         guild: discord.Guild,
         asset: discord.Asset,
     ):
-        webhook = discord.Webhook.from_url(
-            random.choice(self.bot.config["webhooks"]["images"]),
-            session=self.bot.session,
+        # already on record, nothing to download
+        exists = await self.bot.pool.fetchval(
+            "SELECT 1 FROM guild_icons WHERE icon_key = $1 AND guild_id = $2",
+            asset.key,
+            guild.id,
         )
+        if exists:
+            return
+
         try:
-            image = await asyncio.to_thread(
-                resize_to_limit, BytesIO(await asset.read()), 8388608
-            )
-            message = await webhook.send(
-                f"{guild.name} | {guild.id} | {guild.member_count:,} | {discord.utils.format_dt(discord.utils.utcnow())}",
-                file=discord.File(image, filename=f"{guild.id}_{asset.key}.png"),
-                wait=True,
-                allowed_mentions=discord.AllowedMentions.none(),
-            )
+            data = await asset.read()
         except discord.HTTPException:
             return
 
+        mirror = None
+        if self.bot.config.get("blobs", {}).get("mirror_to_webhooks"):
+            mirror = functools.partial(self.mirror_icon, guild, asset, data)
+        digest, url = await self.bot.image_index.store(data, mirror)
+
         sql = """
-        INSERT INTO guild_icons(guild_id, icon_key, created_at, icon)
-        VALUES($1, $2, $3, $4)"""
+        INSERT INTO guild_icons(guild_id, icon_key, created_at, icon, icon_hash)
+        VALUES($1, $2, $3, $4, $5)"""
 
         try:
             await self.bot.pool.execute(
@@ -50,7 +63,8 @@ class Guild(Cog):
                 guild.id,
                 asset.key,
                 discord.utils.utcnow(),
-                message.attachments[0].url,
+                url,
+                digest,
             )
         except asyncpg.UniqueViolationError:
             pass
@@ -66,7 +80,7 @@ class Guild(Cog):
         if "icon" in await self.bot.redis.smembers(f"guild_opted_out:{after_g.id}"):
             return
 
-        await self.add_icon(after_g, after_g.icon)
+        self.ingest.submit(self.add_icon, after_g, after_g.icon)
 
     async def add_name(self, guild: discord.Guild):
         sql = """
@@ -1,18 +1,71 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, Union
+import asyncio
+import random
+import string
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 import discord
 from discord.abc import Messageable
 from discord.ext import commands
 
 from core import Cog
-from utils import fish_owner, greenTick
+from utils import cache, fish_owner, fuzzy, greenTick
 
 if TYPE_CHECKING:
     from core import Fishie
 
 
+def make_queries(choices: List[str], amount: int) -> List[str]:
+    # chunks of real entries, every other one with a typo
+    queries = []
+    for n in range(amount):
+        choice = random.choice(choices)
+        start = random.randint(0, max(len(choice) - 3, 0))
+        query = choice[start : start + random.randint(3, 10)]
+        if n % 2 and query:
+            i = random.randrange(len(query))
+            query = query[:i] + random.choice(string.ascii_lowercase) + query[i + 1 :]
+        queries.append(query)
+
+    return queries
+
+
+def bench_fuzzy(choices: List[str], queries: List[str]) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    index = fuzzy.FuzzyIndex(choices)
+    timings["build"] = time.perf_counter() - start
+
+    mismatches = 0
+    for name, plain, indexed in (
+        (
+            "finder",
+            lambda q: fuzzy.finder(q, choices),
+            lambda q: index.finder(q),
+        ),
+        (
+            "extract",
+            lambda q: fuzzy.extract(q, choices, scorer=fuzzy.ratio),
+            lambda q: index.extract(q, scorer=fuzzy.ratio),
+        ),
+    ):
+        start = time.perf_counter()
+        expected = [plain(q) for q in queries]
+        timings[name] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        got = [indexed(q) for q in queries]
+        timings[f"{name} (index)"] = time.perf_counter() - start
+
+        mismatches += sum(a != b for a, b in zip(expected, got))
+
+    timings["mismatches"] = mismatches
+    return timings
+
+
 class Owner(Cog):
     emoji = fish_owner
     hidden: bool = True
@@ -47,6 +100,239 @@ class Owner(Cog):
 
         await ctx.message.add_reaction(greenTick)
 
+    @commands.command(name="startup")
+    async def startup(self, ctx: commands.Context[Fishie]):
+        """Shows how long each extension, cog and warmup took to load"""
+        bot = ctx.bot
+        sections = (
+            ("Extensions", bot.extension_load_times),
+            ("Cogs", bot.cog_load_times),
+            ("Warmups", bot.warmup_times),
+        )
+
+        lines = []
+        for title, times in sections:
+            lines.append(f"{title}:")
+            for name, elapsed in sorted(
+                times.items(), key=lambda t: t[1], reverse=True
+            ):
+                lines.append(f"  {name:<32} {elapsed * 1000:>10.2f}ms")
+
+        pending = [name for name, task in bot.warmups.items() if not task.done()]
+        if pending:
+            lines.append(f"Pending warmups: {', '.join(pending)}")
+
+        text = "\n".join(lines)
+        if len(text) > 1990:
+            return await ctx.send(file=bot.too_big(text))
+
+        await ctx.send(f"```\n{text}\n```")
+
+    @commands.command(name="fuzzybench")
+    async def fuzzybench(self, ctx: commands.Context[Fishie], amount: int = 200):
+        """Benchmarks fuzzy.FuzzyIndex against the plain fuzzy functions"""
+        bot = ctx.bot
+        datasets = {
+            "pokemon": bot.pokemon,
+            "commands": sorted({c.qualified_name for c in bot.walk_commands()}),
+        }
+        if bot.tools is not None:
+            datasets["timezones"] = list(bot.tools._timezone_aliases) + sorted(
+                bot.tools.valid_timezones
+            )
+
+        lines = []
+        async with ctx.typing():
+            for name, choices in datasets.items():
+                if not choices:
+                    continue
+
+                queries = make_queries(choices, amount)
+                timings = await asyncio.to_thread(bench_fuzzy, choices, queries)
+                lines.append(
+                    f"{name} ({len(choices):,} entries, {len(queries)} queries, {timings.pop('mismatches'):.0f} mismatches):"
+                )
+                for label, elapsed in timings.items():
+                    lines.append(f"  {label:<16} {elapsed * 1000:>10.2f}ms")
+
+        text = "\n".join(lines)
+        await ctx.send(f"```\n{text}\n```")
+
+    @commands.command(name="timers")
+    async def timers(self, ctx: commands.Context[Fishie]):
+        """Shows how late reminders and other timers have been firing"""
+        tools = ctx.bot.tools
+        if tools is None:
+            raise commands.BadArgument("The tools cog isn't loaded.")
+
+        lines = [
+            f"Scheduled: {len(tools._scheduled):,} (window ends {tools._window_end})",
+            f"Fired: {tools.timers_fired:,}, largest batch: {tools.largest_timer_batch:,}",
+        ]
+
+        lag = sorted(tools.timer_lag)
+        if lag:
+            lines.append(
+                f"Lag over the last {len(lag):,}: "
+                f"p50 {lag[len(lag) // 2] * 1000:.2f}ms, "
+                f"p95 {lag[int(len(lag) * 0.95)] * 1000:.2f}ms, "
+                f"max {lag[-1] * 1000:.2f}ms"
+            )
+
+        text = "\n".join(lines)
+        await ctx.send(f"```\n{text}\n```")
+
+    @commands.command(name="cachestats")
+    async def cachestats(self, ctx: commands.Context[Fishie]):
+        """Shows where cached lookups have been answered from"""
+        settings = ctx.bot.user_settings
+        lines = [f"User settings ({len(settings._timezones):,} in memory):"]
+        for tier, count in settings.stats.items():
+            lines.append(f"  {tier:<16} {count:>10,}")
+
+        thumbnails = ctx.bot.thumbnails.stats
+        lines.append(
+            f"Thumbnails: {thumbnails['disk']:,} from disk, {thumbnails['blobs']:,} from blobs, "
+            f"{thumbnails['created']:,} created, {thumbnails['failed']:,} failed"
+        )
+        blobs = ctx.bot.blobs.stats
+        lines.append(
+            f"Blobs: {blobs['stored']:,} stored, {blobs['deduplicated']:,} deduplicated, "
+            f"{blobs['read']:,} read"
+        )
+        index = ctx.bot.image_index.stats
+        lines.append(f"Image index: {index['exact']:,} known, {index['new']:,} new")
+
+        entries, size, apis = ctx.bot.http_cache.report()
+        lines.append(f"HTTP ({entries:,} responses, {size / 1024:,.1f}KiB):")
+        for api, stats in apis.items():
+            lines.append(
+                f"  {api:<16} {stats.hits:,} hits, {stats.joined:,} joined, "
+                f"{stats.revalidated:,} revalidated, {stats.misses:,} misses "
+                f"({stats.hit_ratio:.1%}), {stats.requests_saved:,} requests and "
+                f"{stats.bytes_saved / 1024:,.1f}KiB saved"
+            )
+
+        lines.append("Spotify:")
+        for endpoint, stats in ctx.bot.spotify.stats.items():
+            lines.append(
+                f"  {endpoint:<16} {stats.requests:,} requests, {stats.retries:,} retries, "
+                f"{stats.average_latency * 1000:.2f}ms avg, {stats.slowest * 1000:.2f}ms max"
+            )
+
+        for name, stats in cache.get_cache_stats().items():
+            lines.append(
+                f"{name}: {stats.hits:,} hits, {stats.misses:,} misses "
+                f"({stats.hit_ratio:.1%}), {stats.shared_hits:,} shared hits "
+                f"({stats.shared_hit_ratio:.1%}), {stats.failures:,} failures, "
+                f"{stats.refreshes:,} refreshes, {stats.average_latency * 1000:.2f}ms/miss"
+            )
+
+        text = "\n".join(lines)
+        if len(text) > 1990:
+            return await ctx.send(file=ctx.bot.too_big(text))
+
+        await ctx.send(f"```\n{text}\n```")
+
+    @commands.command(name="imagestats")
+    async def imagestats(self, ctx: commands.Context[Fishie]):
+        """Shows how long image processing has been taking"""
+        images = ctx.bot.images
+        lines = [
+            f"Pending: {images.pending / 1024:,.1f}KiB of {images.max_pending / 1024:,.1f}KiB, "
+            f"{images.workers} workers"
+        ]
+        for op, stats in images.stats.items():
+            if not stats.calls:
+                lines.append(f"{op:<14} {stats.failures:,} failures")
+                continue
+
+            lines.append(
+                f"{op:<14} {stats.calls:,} calls, {stats.failures:,} failures, "
+                f"{stats.average * 1000:.2f}ms avg, {stats.slowest * 1000:.2f}ms max, "
+                f"{stats.waited / stats.calls * 1000:.2f}ms queued, "
+                f"{stats.worked / stats.calls * 1000:.2f}ms in worker, "
+                f"{stats.bytes_in / 1024:,.1f}KiB in, {stats.bytes_out / 1024:,.1f}KiB out"
+            )
+
+        text = "\n".join(lines)
+        if len(text) > 1990:
+            return await ctx.send(file=ctx.bot.too_big(text))
+
+        await ctx.send(f"```\n{text}\n```")
+
+    @commands.command(name="ingest")
+    async def ingest(self, ctx: commands.Context[Fishie]):
+        """Shows how far behind avatar and icon logging is"""
+        logging = ctx.bot.logging
+        if logging is None:
+            raise commands.BadArgument("The logging cog isn't loaded.")
+
+        queue = logging.ingest
+        lines = [
+            f"Queued: {queue.depth:,} (deepest {queue.deepest:,}), {queue.workers} workers",
+            f"Processed: {queue.processed:,}, failed: {queue.failed:,}, dropped: {queue.dropped:,}",
+        ]
+
+        lag = sorted(queue.lag)
+        if lag:
+            lines.append(
+                f"Lag over the last {len(lag):,}: "
+                f"p50 {lag[len(lag) // 2] * 1000:.2f}ms, "
+                f"p95 {lag[int(len(lag) * 0.95)] * 1000:.2f}ms, "
+                f"max {lag[-1] * 1000:.2f}ms"
+            )
+
+        now = time.monotonic()
+        for i, bucket in enumerate(ctx.bot.image_webhooks.buckets):
+            remaining = "?" if bucket.remaining is None else f"{bucket.remaining}"
+            reset = max(bucket.reset_at - now, 0)
+            lines.append(
+                f"Webhook {i}: {remaining} left, resets in {reset:.1f}s, "
+                f"{bucket.in_flight} in flight, {bucket.uploads:,} uploads, "
+                f"{bucket.rate_limited:,} rate limited"
+            )
+
+        text = "\n".join(lines)
+        await ctx.send(f"```\n{text}\n```")
+
+    @commands.command(name="blobmigrate")
+    async def blobmigrate(
+        self, ctx: commands.Context[Fishie], batch_size: int = 25, delay: float = 2.0
+    ):
+        """Copies logged images still on webhook URLs into the blob store"""
+        logging = ctx.bot.logging
+        if logging is None:
+            raise commands.BadArgument("The logging cog isn't loaded.")
+
+        counts = logging.blob_migration_counts
+        task = logging.blob_migration
+        if task is not None and not task.done():
+            return await ctx.send(
+                f"Already running, {counts['migrated']:,} migrated and {counts['failed']:,} failed so far."
+            )
+
+        counts.update(migrated=0, failed=0)
+        logging.blob_migration = asyncio.create_task(
+            logging.migrate_to_blobs(batch_size=batch_size, delay=delay)
+        )
+        await ctx.send(
+            f"Started, {batch_size} downloads every {delay:g}s. Run this again to see progress."
+        )
+
+    @commands.command(name="googlekeys")
+    async def googlekeys(self, ctx: commands.Context[Fishie]):
+        """Shows how much each Google API key has been used today"""
+        lines = []
+        for api in ("customsearch", "youtube"):
+            lines.append(f"{api}:")
+            for key_id, count, exhausted in await ctx.bot.google_keys.usage(api):
+                status = "ok" if exhausted is None else f"{exhausted} limit"
+                lines.append(f"  {key_id} {count:>8,} {status}")
+
+        text = "\n".join(lines)
+        await ctx.send(f"```\n{text}\n```")
+
     async def cog_check(self, ctx: commands.Context[Fishie]) -> bool:
         if await ctx.bot.is_owner(ctx.author):
             return True
@@ -7,7 +7,6 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional
 import discord
 from discord.ext import commands
 from discord.utils import escape_markdown
-from playwright.async_api import async_playwright
 
 from utils import (
     Pager,
@@ -16,6 +15,7 @@ from utils import (
     UrbanPageSource,
     URLConverter,
     get_or_fetch_user,
+    lazy_import,
 )
 
 from .downloads import Downloads
@@ -25,8 +25,12 @@ from .reminders import Reminder
 from .spotify import Spotify
 
 if TYPE_CHECKING:
+    from playwright import async_api
+
     from core import Fishie
     from extensions.context import Context
+else:
+    async_api = lazy_import("playwright.async_api")
 
 param = commands.param
 
@@ -53,7 +57,7 @@ class Tools(Downloads, Reminder, Google, Spotify, PurgeCog):
     ):
         """Screenshot a website from the internet"""
         async with ctx.typing():
-            async with async_playwright() as playwright:
+            async with async_api.async_playwright() as playwright:
                 browser = await playwright.chromium.launch()
                 page = await browser.new_page(locale="en-US")
                 await page.goto(website)
@@ -83,12 +87,13 @@ class Tools(Downloads, Reminder, Google, Spotify, PurgeCog):
 
         url = "https://api.urbandictionary.com/v0/define"
 
-        async with ctx.session.get(url, params={"term": word}) as resp:
-            json = await resp.json()
-            data: List[Dict[Any, Any]] = json.get("list", [])
+        resp = await self.bot.http_cache.get(
+            "urban", url, params={"term": word}, ttl=6 * 3600
+        )
+        data: List[Dict[Any, Any]] = resp.json().get("list", [])
 
-            if not data:
-                raise commands.BadArgument("Nothing was found for this phrase.")
+        if not data:
+            raise commands.BadArgument("Nothing was found for this phrase.")
 
         p = UrbanPageSource(data, per_page=4)
         menu = Pager(p, ctx=ctx)
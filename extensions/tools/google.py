@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import random
 import textwrap
-from typing import TYPE_CHECKING, Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 import discord
 from discord import app_commands
@@ -11,9 +10,12 @@ from discord.ext import commands
 from core import Cog
 from utils import (
     AuthorView,
+    CachedResponse,
     GoogleImageData,
     GoogleImagePageSource,
     Pager,
+    parse_retry_after,
+    quota_error,
     response_checker,
 )
 
@@ -35,9 +37,45 @@ link_converter = {
 
 
 class Google(Cog):
+    # seconds search results are reused for, every request costs quota
+    SEARCH_TTL = 3600
+
     def __init__(self, bot: Fishie) -> None:
         self.bot = bot
 
+    async def google_request(
+        self, api: str, url: str, params: Dict[str, Any], *, ttl: float
+    ) -> CachedResponse:
+        """GETs a Google API with a key from the scheduler.
+
+        Keys that turn out to be out of quota are marked as such and the
+        next one is tried.
+        """
+        cache = self.bot.http_cache
+        if cache.is_fresh(url, params):
+            # the key isn't part of the cache key, no need to spend one
+            return await cache.get(api, url, params=params, ttl=ttl)
+
+        tried: List[str] = []
+        while True:
+            key = await self.bot.google_keys.acquire(api, exclude=tried)
+            r = await cache.get(api, url, params={**params, "key": key}, ttl=ttl)
+
+            try:
+                body: Optional[Any] = r.json()
+            except (ValueError, UnicodeDecodeError):
+                body = None
+
+            reason = quota_error(r.status, body)
+            if reason is None:
+                return r
+
+            retry_after = parse_retry_after(r.headers.get("Retry-After"))
+            await self.bot.google_keys.exhausted(
+                api, key, reason, retry_after=retry_after
+            )
+            tried.append(key)
+
     @commands.hybrid_command(name="google")
     async def google(self, ctx: Context, *, query: str):
         """Search something on the web"""
@@ -46,7 +84,6 @@ class Google(Cog):
         params = {
             "cx": self.bot.config["keys"]["google_id"],
             "q": query,
-            "key": random.choice(self.bot.config["keys"]["google"]),
             "safe": (
                 "off"
                 if isinstance(
@@ -62,30 +99,30 @@ class Google(Cog):
         }
         await ctx.typing()
 
-        async with self.bot.session.get(url, params=params) as r:
-            response_checker(r)
-            data = await r.json()
+        r = await self.google_request("customsearch", url, params, ttl=self.SEARCH_TTL)
+        response_checker(r)
+        data = r.json()
 
-            embed = discord.Embed(color=discord.Colour.pink())
-            embed.set_footer(
-                text=f"About {data['searchInformation']['formattedTotalResults']} results ({data['searchInformation']['formattedSearchTime']} seconds)"
-            )
+        embed = discord.Embed(color=discord.Colour.pink())
+        embed.set_footer(
+            text=f"About {data['searchInformation']['formattedTotalResults']} results ({data['searchInformation']['formattedSearchTime']} seconds)"
+        )
 
-            embed.title = f"Google Search - {query}"[:256]
+        embed.title = f"Google Search - {query}"[:256]
 
-            text = ""
-            items = data["items"]
+        text = ""
+        items = data["items"]
 
-            added = 0
-            for item in items:
-                if added == 5:
-                    break
-                try:
-                    text += f"[{item['title']}]({item['link']})\n{item['snippet']}\n\n"
-                    added += 1
-                except KeyError:
-                    continue
-            embed.description = text
+        added = 0
+        for item in items:
+            if added == 5:
+                break
+            try:
+                text += f"[{item['title']}]({item['link']})\n{item['snippet']}\n\n"
+                added += 1
+            except KeyError:
+                continue
+        embed.description = text
 
         await ctx.send(embed=embed)
 
@@ -100,7 +137,6 @@ class Google(Cog):
         params = {
             "cx": self.bot.config["keys"]["google_id"],
             "q": query,
-            "key": random.choice(self.bot.config["keys"]["google"]),
             "searchType": "image",
             "safe": (
                 "off"
@@ -117,25 +153,25 @@ class Google(Cog):
         }
 
         await ctx.typing()
-        async with self.bot.session.get(url, params=params) as r:
-            response_checker(r)
-            results = await r.json()
-
-            items = results.get("items")
-
-            if items is None:
-                raise commands.BadArgument("No search results found for this query.")
-
-            entries = [
-                GoogleImageData(
-                    image_url=data["link"],
-                    url=data["image"]["contextLink"],
-                    snippet=data["snippet"],
-                    query=query,
-                    author=ctx.author,
-                )
-                for data in results["items"]
-            ]
+        r = await self.google_request("customsearch", url, params, ttl=self.SEARCH_TTL)
+        response_checker(r)
+        results = r.json()
+
+        items = results.get("items")
+
+        if items is None:
+            raise commands.BadArgument("No search results found for this query.")
+
+        entries = [
+            GoogleImageData(
+                image_url=data["link"],
+                url=data["image"]["contextLink"],
+                snippet=data["snippet"],
+                query=query,
+                author=ctx.author,
+            )
+            for data in results["items"]
+        ]
 
         pager = Pager(GoogleImagePageSource(entries), ctx=ctx)
         await pager.start(ctx)
@@ -149,20 +185,19 @@ class Google(Cog):
         url = f"https://www.googleapis.com/youtube/v3/search"
         params = {
             "q": query,
-            "key": random.choice(self.bot.config["keys"]["google"]),
             "part": "snippet",
             "type": type,
             "maxResults": 25,
         }
 
         await ctx.typing()
-        async with self.bot.session.get(url, params=params) as r:
-            response_checker(r)
-            data = await r.json()
-            try:
-                url = f"https://www.youtube.com/{link_converter[type]}{data['items'][0]['id'][id_converter[type]]}"
-            except (IndexError, KeyError):
-                raise commands.BadArgument("Couldn't find any results.")
+        r = await self.google_request("youtube", url, params, ttl=self.SEARCH_TTL)
+        response_checker(r)
+        data = r.json()
+        try:
+            url = f"https://www.youtube.com/{link_converter[type]}{data['items'][0]['id'][id_converter[type]]}"
+        except (IndexError, KeyError):
+            raise commands.BadArgument("Couldn't find any results.")
 
         videos = data["items"]
         view = YoutubeView(ctx, videos, type)
@@ -7,6 +7,7 @@ from typing import (
     Any,
     Awaitable,
     Callable,
+    List,
     Literal,
     Optional,
     TypeAlias,
@@ -16,6 +17,7 @@ from typing import (
 import discord
 from discord import app_commands
 from discord.ext import commands
+from discord.http import Route
 
 from core import Cog
 from utils import plural
@@ -148,45 +150,33 @@ class PurgeCog(Cog):
 
         await ctx.send(f"Deleted {plural(len(deleted)):message}.", delete_after=7)
 
+    async def delete_invites(
+        self, ctx: GuildContext, invites: List[discord.Invite], amount: Optional[int]
+    ):
+        if amount:
+            invites = invites[:amount]
+
+        reason = f"Purge invites command invoked by {ctx.author} (ID: {ctx.author.id})"
+        result = await ctx.bot.bulk.run(
+            invites,
+            lambda invite: invite.delete(reason=reason),
+            route=Route("DELETE", "/invites/{invite_id}", invite_id=""),
+        )
+
+        text = f"Deleted {len(result.succeeded)}/{result.total} invites."
+        if result.failed:
+            text += f" ({result.describe_failures()})"
+        await ctx.send(text)
+
     async def purge_guild_invites(
         self, ctx: GuildContext, guild: discord.Guild, amount: Optional[int] = None
     ):
-        invites = await guild.invites()
-
-        completed = 0
-        failed = 0
-        for invite in invites:
-            try:
-                await invite.delete(
-                    reason=f"Purge invites command invoked by {ctx.author} (ID: {ctx.author.id})"
-                )
-            except (discord.NotFound, discord.HTTPException):
-                failed += 1
-            completed += 1
-            if amount and completed >= amount:
-                break
-
-        await ctx.send(f"Deleted {completed - failed}/{completed} invites.")
+        await self.delete_invites(ctx, await guild.invites(), amount)
 
     async def purge_channel_invites(
         self, ctx: GuildContext, channel: InviteChannels, amount: Optional[int] = None
     ):
-        invites = await channel.invites()
-
-        completed = 0
-        failed = 0
-        for invite in invites:
-            try:
-                await invite.delete(
-                    reason=f"Purge invites command invoked by {ctx.author} (ID: {ctx.author.id})"
-                )
-            except (discord.NotFound, discord.HTTPException):
-                failed += 1
-            completed += 1
-            if amount and completed >= amount:
-                break
-
-        await ctx.send(f"Deleted {completed - failed}/{completed} invites.")
+        await self.delete_invites(ctx, await channel.invites(), amount)
 
     @commands.hybrid_command(name="purge-invites")
     @commands.has_guild_permissions(manage_guild=True, manage_channels=True)
@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import heapq
+import json
+import os
 import random
 import textwrap
-from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Sequence
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Iterable, NamedTuple, Optional, Sequence
 
 import asyncpg
 
@@ -14,38 +18,24 @@ import discord
 from dateutil.zoneinfo import get_zonefile_instance
 from discord import app_commands
 from discord.ext import commands
-from lxml import etree
 from typing_extensions import Annotated
 
 from core import Cog
-from utils import FieldPageSource, Pager, cache, formats, fuzzy, time
+from utils import FieldPageSource, Pager, formats, fuzzy, lazy_import, time
 
 if TYPE_CHECKING:
+    from lxml import etree
     from typing_extensions import Self
 
     from core.bot import Fishie
     from extensions.context import Context
+else:
+    etree = lazy_import("lxml.etree")
 
-
-class MaybeAcquire:
-    def __init__(
-        self, connection: Optional[asyncpg.Connection], *, pool: asyncpg.Pool
-    ) -> None:
-        self._connection: Optional[asyncpg.Connection] = connection
-        self.pool: asyncpg.Pool = pool
-        self._cleanup: bool = False
-
-    async def __aenter__(self) -> asyncpg.Connection:
-        if self._connection is None:
-            self._cleanup = True
-            self._connection = c = await self.pool.acquire()  # type: ignore
-            return c  # type: ignore
-
-        return self._connection
-
-    async def __aexit__(self, *args) -> None:
-        if self._cleanup:
-            await self.pool.release(self._connection)  # type: ignore
+TIMEZONE_CACHE = "files/timezones.json"
+TIMEZONE_CACHE_MAX_AGE = 7 * 86400  # seconds
+# bumped whenever the layout of the file changes, older files are rebuilt
+TIMEZONE_CACHE_VERSION = 2
 
 
 class TimeZone(NamedTuple):
@@ -55,6 +45,9 @@ class TimeZone(NamedTuple):
     @classmethod
     async def convert(cls, ctx: Context, argument: str) -> Self:
         assert isinstance(ctx.cog, Reminder)
+        if not ctx.cog._default_timezones:
+            # nothing cached on disk, have to wait for CLDR
+            await ctx.bot.wait_for_warmup("timezones")
 
         # Prioritise aliases because they handle short codes slightly better
         if argument in ctx.cog._timezone_aliases:
@@ -75,7 +68,18 @@ class TimeZone(NamedTuple):
 
 
 class Timer:
-    __slots__ = ("args", "kwargs", "event", "id", "created_at", "expires", "timezone")
+    __slots__ = (
+        "args",
+        "kwargs",
+        "event",
+        "id",
+        "created_at",
+        "expires",
+        "timezone",
+        "author_id",
+        "channel_id",
+        "message",
+    )
 
     def __init__(self, *, record: asyncpg.Record):
         self.id: int = record["id"]
@@ -87,6 +91,9 @@ class Timer:
         self.created_at: datetime.datetime = record["created"]
         self.expires: datetime.datetime = record["expires"]
         self.timezone: str = record["timezone"]
+        self.author_id: Optional[int] = record["author_id"]
+        self.channel_id: Optional[int] = record["channel_id"]
+        self.message: Optional[str] = record["message"]
 
     @classmethod
     def temporary(
@@ -98,6 +105,9 @@ class Timer:
         args: Sequence[Any],
         kwargs: dict[str, Any],
         timezone: str,
+        author_id: Optional[int] = None,
+        channel_id: Optional[int] = None,
+        message: Optional[str] = None,
     ) -> Self:
         pseudo = {
             "id": None,
@@ -106,6 +116,9 @@ class Timer:
             "created": created,
             "expires": expires,
             "timezone": timezone,
+            "author_id": author_id,
+            "channel_id": channel_id,
+            "message": message,
         }
         return cls(record=pseudo)  # type: ignore
 
@@ -122,12 +135,6 @@ class Timer:
     def human_delta(self) -> str:
         return discord.utils.format_dt(self.created_at, "R")
 
-    @property
-    def author_id(self) -> Optional[int]:
-        if self.args:
-            return int(self.args[0])
-        return None
-
     def __repr__(self) -> str:
         return f"<Timer created={self.created_at} expires={self.expires} event={self.event}>"
 
@@ -177,10 +184,31 @@ class Reminder(Cog):
         "cnsha",  # Asia/Shanghai
     )
 
+    # how far ahead timers are loaded into memory, has to stay under
+    # the ~48 days asyncio can reliably sleep for (http://bugs.python.org/issue20493)
+    TIMER_WINDOW = datetime.timedelta(days=1)
+
+    # how many timers can have their listeners running at once, a batch of
+    # due timers shouldn't all hit the API at the same time
+    TIMER_CONCURRENCY = 10
+
+    # seconds each autocomplete keystroke gets to search the timezones
+    AUTOCOMPLETE_BUDGET = 0.025
+
     def __init__(self, bot: Fishie):
         self.bot: Fishie = bot
-        self._have_data = asyncio.Event()
-        self._current_timer: Optional[Timer] = None
+        # timers expiring before _window_end, the rest are only read from the
+        # database when the window slides over them
+        self._timers: list[tuple[datetime.datetime, int, Timer]] = []
+        self._scheduled: dict[int, Timer] = {}
+        self._window_end: Optional[datetime.datetime] = None
+        self._wakeup = asyncio.Event()
+        self._timer_semaphore = asyncio.Semaphore(self.TIMER_CONCURRENCY)
+        self._timer_tasks: set[asyncio.Task[None]] = set()
+        # seconds between a timer's expiry and it firing
+        self.timer_lag: Deque[float] = deque(maxlen=1000)
+        self.timers_fired = 0
+        self.largest_timer_batch = 0
         self._task = bot.loop.create_task(self.dispatch_timers())
         self.valid_timezones: set[str] = set(get_zonefile_instance().zones)
         # User-friendly timezone names, some manual and most from the CLDR database.
@@ -200,9 +228,13 @@ class Reminder(Cog):
             "PDT": "America/Los_Angeles",
         }
         self._default_timezones: list[app_commands.Choice[str]] = []
+        self._alias_index = fuzzy.FuzzyIndex(self._timezone_aliases)
+        self._zone_index = fuzzy.FuzzyIndex(self.valid_timezones)
 
     async def cog_load(self) -> None:
-        await self.parse_bcp47_timezones()
+        # the CLDR data lives on github so only refresh it in the background
+        if not self.load_timezone_cache():
+            self.bot.add_warmup("timezones", self.parse_bcp47_timezones())
 
     @property
     def display_emoji(self) -> discord.PartialEmoji:
@@ -210,6 +242,62 @@ class Reminder(Cog):
 
     def cog_unload(self) -> None:
         self._task.cancel()
+        for task in self._timer_tasks:
+            task.cancel()
+
+    def load_timezone_cache(self) -> bool:
+        """Loads the CLDR data saved by the last parse.
+
+        Returns whether the data was found and is recent enough to use as is.
+        A file from another version or one that can't be read is ignored, and
+        gets replaced once the data is parsed again.
+        """
+        try:
+            with open(TIMEZONE_CACHE, encoding="utf-8") as fp:
+                data = json.load(fp)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        if not isinstance(data, dict) or data.get("version") != TIMEZONE_CACHE_VERSION:
+            return False
+
+        try:
+            aliases: dict[str, str] = dict(data["aliases"])
+            defaults = [
+                app_commands.Choice(name=name, value=value)
+                for name, value in data["defaults"]
+            ]
+            index = fuzzy.FuzzyIndex.from_dict(data["index"])
+            created: float = data["created"]
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        self._timezone_aliases.update(aliases)
+        self._default_timezones = defaults
+
+        if set(index) != self._timezone_aliases.keys():
+            # the hardcoded aliases changed since it was saved
+            index = fuzzy.FuzzyIndex(self._timezone_aliases)
+
+        self._alias_index = index
+
+        age = discord.utils.utcnow().timestamp() - created
+        return age < TIMEZONE_CACHE_MAX_AGE
+
+    def save_timezone_cache(self) -> None:
+        data = {
+            "version": TIMEZONE_CACHE_VERSION,
+            "created": discord.utils.utcnow().timestamp(),
+            "aliases": self._timezone_aliases,
+            "defaults": [(c.name, c.value) for c in self._default_timezones],
+            "index": self._alias_index.to_dict(),
+        }
+
+        tmp = f"{TIMEZONE_CACHE}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump(data, fp, separators=(",", ":"))
+
+        os.replace(tmp, TIMEZONE_CACHE)
 
     async def parse_bcp47_timezones(self) -> None:
         async with self.bot.session.get(
@@ -248,102 +336,186 @@ class Reminder(Cog):
                 else:
                     self._timezone_aliases[entry.description] = entry.aliases[0]
 
+            default_timezones = []
             for key in self.DEFAULT_POPULAR_TIMEZONE_IDS:
                 entry = entries.get(key)
                 if entry is not None:
-                    self._default_timezones.append(
+                    default_timezones.append(
                         app_commands.Choice(
                             name=entry.description, value=entry.aliases[0]
                         )
                     )
 
-    @cache.cache()
+            self._default_timezones = default_timezones
+
+        self._alias_index = fuzzy.FuzzyIndex(self._timezone_aliases)
+        await asyncio.to_thread(self.save_timezone_cache)
+
     async def get_timezone(self, user_id: int, /) -> Optional[str]:
-        query = "SELECT timezone from user_settings WHERE user_id = $1;"
-        record = await self.bot.pool.fetchrow(query, user_id)
-        return record["timezone"] if record else None
+        return await self.bot.user_settings.get_timezone(user_id)
 
     async def get_tzinfo(self, user_id: int, /) -> datetime.tzinfo:
-        tz = await self.get_timezone(user_id)
-        if tz is None:
-            return datetime.timezone.utc
-        return dateutil.tz.gettz(tz) or datetime.timezone.utc
+        return await self.bot.user_settings.get_tzinfo(user_id)
 
     def find_timezones(self, query: str) -> list[TimeZone]:
         # A bit hacky, but if '/' is in the query then it's looking for a raw identifier
         # otherwise it's looking for a CLDR alias
+        if "/" in query:
+            return [TimeZone(key=a, label=a) for a in self._zone_index.finder(query)]
+
+        keys = self._alias_index.finder(query)
+        return [TimeZone(label=k, key=self._timezone_aliases[k]) for k in keys]
+
+    def search_timezones(self, query: str, *, limit: int = 25) -> list[TimeZone]:
+        """`find_timezones` for autocomplete, answers within a fixed budget and tolerates typos."""
+        budget = self.AUTOCOMPLETE_BUDGET
         if "/" in query:
             return [
                 TimeZone(key=a, label=a)
-                for a in fuzzy.finder(query, self.valid_timezones)
+                for a in self._zone_index.search(query, limit=limit, budget=budget)
             ]
 
-        keys = fuzzy.finder(query, self._timezone_aliases.keys())
+        keys = self._alias_index.search(query, limit=limit, budget=budget)
         return [TimeZone(label=k, key=self._timezone_aliases[k]) for k in keys]
 
-    async def get_active_timer(
-        self, *, connection: Optional[asyncpg.Connection] = None, days: int = 7
-    ) -> Optional[Timer]:
-        query = """
-            SELECT * FROM reminders
-            WHERE (expires AT TIME ZONE 'UTC' AT TIME ZONE timezone) < (CURRENT_TIMESTAMP + $1::interval)
-            ORDER BY expires
-            LIMIT 1;
-        """
-        con = connection or self.bot.pool
+    def _schedule_timer(self, timer: Timer) -> None:
+        if self._window_end is None or timer.expires >= self._window_end:
+            # the refill that covers it will pick it up from the database
+            return
 
-        record = await con.fetchrow(query, datetime.timedelta(days=days))
-        return Timer(record=record) if record else None
+        if timer.id in self._scheduled:
+            return
 
-    async def wait_for_active_timers(
-        self, *, connection: Optional[asyncpg.Connection] = None, days: int = 7
-    ) -> Timer:
-        async with MaybeAcquire(connection=connection, pool=self.bot.pool) as con:
-            timer = await self.get_active_timer(connection=con, days=days)
-            if timer is not None:
-                self._have_data.set()
+        self._scheduled[timer.id] = timer
+        heapq.heappush(self._timers, (timer.expires, timer.id, timer))
+        if self._timers[0][1] == timer.id:
+            # earlier than whatever the dispatcher is sleeping on
+            self._wakeup.set()
+
+    def _unschedule_timers(self, ids: Iterable[int]) -> None:
+        for timer_id in ids:
+            self._scheduled.pop(timer_id, None)
+
+        # deleted timers are dropped from the heap lazily, unless they pile up
+        if len(self._timers) > 2 * len(self._scheduled) + 64:
+            self._timers = [t for t in self._timers if t[1] in self._scheduled]
+            heapq.heapify(self._timers)
+
+        self._wakeup.set()
+
+    def _peek_timer(self) -> Optional[Timer]:
+        while self._timers:
+            _, timer_id, timer = self._timers[0]
+            if timer_id in self._scheduled:
                 return timer
 
-            self._have_data.clear()
-            self._current_timer = None
-            await self._have_data.wait()
+            heapq.heappop(self._timers)
+
+        return None
 
-            # At this point we always have data
-            return await self.get_active_timer(connection=con, days=days)  # type: ignore
+    async def refill_timers(self) -> None:
+        """Loads the timers expiring before the end of the next window into the heap."""
+        start = self._window_end
+        # set before querying so timers created in the meantime get scheduled,
+        # anything fetched twice is deduplicated by ID
+        end = self._window_end = datetime.datetime.utcnow() + self.TIMER_WINDOW
+
+        if start is None:
+            query = "SELECT * FROM reminders WHERE expires < $1 ORDER BY expires;"
+            records = await self.bot.pool.fetch(query, end)
+        else:
+            query = "SELECT * FROM reminders WHERE expires >= $1 AND expires < $2 ORDER BY expires;"
+            records = await self.bot.pool.fetch(query, start, end)
+
+        for record in records:
+            self._schedule_timer(Timer(record=record))
+
+    def fire_timer(self, timer: Timer) -> None:
+        self.timer_lag.append(
+            (datetime.datetime.utcnow() - timer.expires).total_seconds()
+        )
+        self.timers_fired += 1
 
-    async def call_timer(self, timer: Timer) -> None:
-        # delete the timer
-        query = "DELETE FROM reminders WHERE id=$1;"
-        await self.bot.pool.execute(query, timer.id)
+        task = asyncio.create_task(self.run_timer(timer))
+        self._timer_tasks.add(task)
+        task.add_done_callback(self._timer_tasks.discard)
 
-        # dispatch the event
+    async def run_timer(self, timer: Timer) -> None:
+        """Dispatches '{event}_timer_complete', bounded by TIMER_CONCURRENCY.
+
+        Cog listeners are awaited here rather than through bot.dispatch, which
+        would start them as tasks of their own with nothing holding them back.
+        Everything else bot.dispatch does, resolving wait_for and calling an
+        on_ method defined on the bot, still goes through discord.Client.
+        """
         event_name = f"{timer.event}_timer_complete"
-        self.bot.dispatch(event_name, timer)
+        listeners = self.bot.extra_events.get(f"on_{event_name}", [])
+
+        async def run(listener: Any) -> None:
+            try:
+                await listener(timer)
+            except Exception:
+                await self.bot.on_error(event_name, timer)
+
+        async with self._timer_semaphore:
+            # skips BotBase.dispatch, which would schedule the listeners below too
+            discord.Client.dispatch(self.bot, event_name, timer)
+            await asyncio.gather(*(run(listener) for listener in listeners))
+
+    async def call_timers(self, now: datetime.datetime) -> None:
+        # claim everything that's due in one query, timers deleted in the
+        # meantime won't be returned and so won't fire
+        query = "DELETE FROM reminders WHERE expires <= $1 RETURNING *;"
+        records = await self.bot.pool.fetch(query, now)
+        self.largest_timer_batch = max(self.largest_timer_batch, len(records))
+
+        for record in records:
+            self.fire_timer(Timer(record=record))
 
     async def dispatch_timers(self) -> None:
         try:
+            await self.refill_timers()
+
             while not self.bot.is_closed():
-                # can only asyncio.sleep for up to ~48 days reliably
-                # so we're gonna cap it off at 40 days
-                # see: http://bugs.python.org/issue20493
-                timer = self._current_timer = await self.wait_for_active_timers(days=40)
+                timer = self._peek_timer()
                 now = datetime.datetime.utcnow()
 
-                if timer.expires >= now:
-                    to_sleep = (timer.expires - now).total_seconds()
-                    await asyncio.sleep(to_sleep)
+                assert self._window_end is not None
+                wait_until = timer.expires if timer else self._window_end
+
+                if wait_until > now:
+                    # woken up early when a sooner timer is created or one is deleted
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(
+                            self._wakeup.wait(), (wait_until - now).total_seconds()
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                if timer is None:
+                    await self.refill_timers()
+                    continue
 
-                await self.call_timer(timer)
+                while timer is not None and timer.expires <= now:
+                    heapq.heappop(self._timers)
+                    del self._scheduled[timer.id]
+                    timer = self._peek_timer()
+
+                await self.call_timers(now)
         except asyncio.CancelledError:
             raise
         except (OSError, discord.ConnectionClosed, asyncpg.PostgresConnectionError):
+            self._timers.clear()
+            self._scheduled.clear()
+            self._window_end = None
             self._task.cancel()
             self._task = self.bot.loop.create_task(self.dispatch_timers())
 
     async def short_timer_optimisation(self, seconds: float, timer: Timer) -> None:
         await asyncio.sleep(seconds)
-        event_name = f"{timer.event}_timer_complete"
-        self.bot.dispatch(event_name, timer)
+        self.fire_timer(timer)
 
     async def get_timer(self, event: str, /, **kwargs: Any) -> Optional[Timer]:
         r"""Gets a timer from the database.
@@ -389,17 +561,8 @@ class Reminder(Cog):
             for (i, key) in enumerate(kwargs.keys(), start=2)
         ]
         query = f"DELETE FROM reminders WHERE event = $1 AND {' AND '.join(filtered_clause)} RETURNING id"
-        record: Any = await self.bot.pool.fetchrow(query, event, *kwargs.values())
-
-        # if the current timer is being deleted
-        if (
-            record is not None
-            and self._current_timer
-            and self._current_timer.id == record["id"]
-        ):
-            # cancel the task and re-run it
-            self._task.cancel()
-            self._task = self.bot.loop.create_task(self.dispatch_timers())
+        records = await self.bot.pool.fetch(query, event, *kwargs.values())
+        self._unschedule_timers(r["id"] for r in records)
 
     async def create_timer(
         self, when: datetime.datetime, event: str, /, *args: Any, **kwargs: Any
@@ -427,6 +590,12 @@ class Reminder(Cog):
             Special keyword-only argument to use as the timezone for the
             expiry time. This automatically adjusts the expiry time to be
             in the future, should it be in the past.
+        author_id: int
+            Special keyword-only argument for who the timer belongs to.
+        channel_id: int
+            Special keyword-only argument for the channel the timer is for.
+        message: str
+            Special keyword-only argument for the text of the timer.
 
         Note
         ------
@@ -445,6 +614,9 @@ class Reminder(Cog):
             now = discord.utils.utcnow()
 
         timezone_name = kwargs.pop("timezone", "UTC")
+        author_id = kwargs.pop("author_id", None)
+        channel_id = kwargs.pop("channel_id", None)
+        message = kwargs.pop("message", None)
         # Remove timezone information since the database does not deal with it
         when = when.astimezone(datetime.timezone.utc).replace(tzinfo=None)
         now = now.astimezone(datetime.timezone.utc).replace(tzinfo=None)
@@ -456,6 +628,9 @@ class Reminder(Cog):
             expires=when,
             created=now,
             timezone=timezone_name,
+            author_id=author_id,
+            channel_id=channel_id,
+            message=message,
         )
         delta = (when - now).total_seconds()
         if delta <= 60:
@@ -463,30 +638,28 @@ class Reminder(Cog):
             self.bot.loop.create_task(self.short_timer_optimisation(delta, timer))
             return timer
 
-        query = """INSERT INTO reminders (event, extra, expires, created, timezone)
-                   VALUES ($1, $2::jsonb, $3, $4, $5)
+        query = """INSERT INTO reminders (event, extra, expires, created, timezone, author_id, channel_id, message)
+                   VALUES ($1, $2::jsonb, $3, $4, $5, $6, $7, $8)
                    RETURNING id;
                 """
 
         row = await pool.fetchrow(
-            query, event, {"args": args, "kwargs": kwargs}, when, now, timezone_name
+            query,
+            event,
+            {"args": args, "kwargs": kwargs},
+            when,
+            now,
+            timezone_name,
+            author_id,
+            channel_id,
+            message,
         )
 
         if row is None:
             raise commands.BadArgument("No results.")
 
         timer.id = row[0]
-
-        # only set the data check if it can be waited on
-        if delta <= (86400 * 40):  # 40 days
-            self._have_data.set()
-
-        # check if this timer is earlier than our currently run timer
-        if self._current_timer and when < self._current_timer.expires:
-            # cancel the task and re-run it
-            self._task.cancel()
-            self._task = self.bot.loop.create_task(self.dispatch_timers())
-
+        self._schedule_timer(timer)
         return timer
 
     @commands.hybrid_group(
@@ -519,9 +692,9 @@ class Reminder(Cog):
         timer = await self.create_timer(
             when.dt,
             "reminder",
-            ctx.author.id,
-            ctx.channel.id,
-            when.arg,
+            author_id=ctx.author.id,
+            channel_id=ctx.channel.id,
+            message=when.arg,
             created=ctx.message.created_at,
             message_id=ctx.message.id,
             timezone=zone or "UTC",
@@ -550,9 +723,9 @@ class Reminder(Cog):
         timer = await self.create_timer(
             when,
             "reminder",
-            interaction.user.id,
-            interaction.channel_id,
-            text,
+            author_id=interaction.user.id,
+            channel_id=interaction.channel_id,
+            message=text,
             created=interaction.created_at,
             message_id=None,
             timezone=zone or "UTC",
@@ -581,18 +754,14 @@ class Reminder(Cog):
         query = """DELETE FROM reminders
                    WHERE id=$1
                    AND event = 'reminder'
-                   AND extra #>> '{args,0}' = $2;
+                   AND author_id = $2;
                 """
 
-        status = await ctx.bot.pool.execute(query, id, str(ctx.author.id))
+        status = await ctx.bot.pool.execute(query, id, ctx.author.id)
         if status == "DELETE 0":
             return await ctx.send("Could not delete any reminders with that ID.")
 
-        # if the current timer is being deleted
-        if self._current_timer and self._current_timer.id == id:
-            # cancel the task and re-run it
-            self._task.cancel()
-            self._task = self.bot.loop.create_task(self.dispatch_timers())
+        self._unschedule_timers([id])
 
         await ctx.send("Successfully deleted reminder.", ephemeral=True)
 
@@ -605,10 +774,10 @@ class Reminder(Cog):
         query = """SELECT COUNT(*)
                    FROM reminders
                    WHERE event = 'reminder'
-                   AND extra #>> '{args,0}' = $1;
+                   AND author_id = $1;
                 """
 
-        author_id = str(ctx.author.id)
+        author_id = ctx.author.id
         total: asyncpg.Record = await ctx.bot.pool.fetchrow(query, author_id)  # type: ignore
 
         total = total[0]
@@ -621,28 +790,24 @@ class Reminder(Cog):
         if not confirm:
             return await ctx.send("Aborting", ephemeral=True)
 
-        query = """DELETE FROM reminders WHERE event = 'reminder' AND extra #>> '{args,0}' = $1;"""
-        await ctx.bot.pool.execute(query, author_id)
-
-        # Check if the current timer is the one being cleared and cancel it if so
-        if self._current_timer and self._current_timer.author_id == ctx.author.id:
-            self._task.cancel()
-            self._task = self.bot.loop.create_task(self.dispatch_timers())
+        query = """DELETE FROM reminders WHERE event = 'reminder' AND author_id = $1 RETURNING id;"""
+        records = await ctx.bot.pool.fetch(query, author_id)
+        self._unschedule_timers(r["id"] for r in records)
 
         await ctx.send(
             f"Successfully deleted {formats.plural(total):reminder}.", ephemeral=True  # type: ignore
         )
 
     async def reminders_command(self, ctx: Context):
-        query = """SELECT id, expires, extra #>> '{args,2}'
+        query = """SELECT id, expires, message
                    FROM reminders
                    WHERE event = 'reminder'
-                   AND extra #>> '{args,0}' = $1
+                   AND author_id = $1
                    ORDER BY expires
                    LIMIT 10;
                 """
 
-        records = await ctx.bot.pool.fetch(query, str(ctx.author.id))
+        records = await ctx.bot.pool.fetch(query, ctx.author.id)
 
         if len(records) == 0:
             return await ctx.send("No currently running reminders.")
@@ -685,16 +850,7 @@ class Reminder(Cog):
         such as tempblock, tempmute, etc.
         """
 
-        await ctx.bot.pool.execute(
-            """INSERT INTO user_settings (user_id, timezone)
-               VALUES ($1, $2)
-               ON CONFLICT (user_id) DO UPDATE SET timezone = $2;
-            """,
-            ctx.author.id,
-            tz.key,
-        )
-
-        self.get_timezone.invalidate(self, ctx.author.id)
+        await ctx.bot.user_settings.set_timezone(ctx.author.id, tz.key)
         await ctx.send(
             f"Your timezone has been set to {tz.label} (IANA ID: {tz.key}).",
             ephemeral=True,
@@ -726,8 +882,8 @@ class Reminder(Cog):
     ) -> list[app_commands.Choice[str]]:
         if not argument:
             return self._default_timezones
-        matches = self.find_timezones(argument)
-        return [tz.to_choice() for tz in matches[:25]]
+        matches = self.search_timezones(argument)
+        return [tz.to_choice() for tz in matches]
 
     @timezone.command(name="get")
     @app_commands.describe(
@@ -757,25 +913,36 @@ class Reminder(Cog):
     @timezone.command(name="clear")
     async def timezone_clear(self, ctx: Context):
         """Clears your timezone."""
-        await ctx.bot.pool.execute(
-            "UPDATE user_settings SET timezone = NULL WHERE user_id=$1", ctx.author.id
-        )
-        self.get_timezone.invalidate(self, ctx.author.id)
+        await ctx.bot.user_settings.set_timezone(ctx.author.id, None)
         await ctx.send("Your timezone has been cleared.", ephemeral=True)
 
     @commands.Cog.listener()
     async def on_reminder_timer_complete(self, timer: Timer):
-        author_id, channel_id, message = timer.args
+        await self.send_reminder(timer)
+
+    async def send_reminder(self, timer: Timer):
+        channel_id = timer.channel_id
+        author_id = timer.author_id
 
         try:
-            channel: discord.abc.Messageable = self.bot.get_channel(channel_id) or (
-                await self.bot.fetch_channel(channel_id)
-            )  # type: ignore
+            if channel_id is None:
+                # no channel on record, DM the author instead
+                if author_id is None:
+                    return
+                channel: discord.abc.Messageable = self.bot.get_user(author_id) or (
+                    await self.bot.fetch_user(author_id)
+                )
+            else:
+                channel = self.bot.get_channel(channel_id) or (
+                    await self.bot.fetch_channel(channel_id)
+                )  # type: ignore
         except discord.HTTPException:
             return
 
         message_id = timer.kwargs.get("message_id")
-        msg = f"<@{author_id}>, reminder from {timer.human_delta}: {message}"
+        msg = (
+            f"<@{timer.author_id}>, reminder from {timer.human_delta}: {timer.message}"
+        )
 
         try:
             if message_id:
@@ -29,20 +29,13 @@ class Spotify(Cog):
         ],
         query: str,
     ) -> str:
-        url = "https://api.spotify.com/v1/search"
-
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {ctx.bot.spotify_key}",
-        }
-
         api_data = {"q": query, "type": mode, "limit": "10", "market": "US"}
 
-        async with ctx.session.get(url, headers=headers, params=api_data) as resp:
-            response_checker(resp)
-            data: Optional[Dict[Any, Any]] = (
-                (await resp.json()).get(self.format_mode[mode]).get(f"items")
-            )
+        resp = await ctx.bot.spotify.get("search", params=api_data)
+        response_checker(resp)
+        data: Optional[Dict[Any, Any]] = (
+            resp.json().get(self.format_mode[mode]).get(f"items")
+        )
 
         if data == [] or data is None:
             raise commands.BadArgument("No info found for this query")
@@ -2,6 +2,7 @@ import argparse
 import asyncio
 import logging.handlers
 import os
+import pkgutil
 import sys
 import tomllib
 
@@ -9,7 +10,7 @@ import aiohttp
 from redis import asyncio as aioredis
 
 from core import Fishie
-from utils import Config, base_header, create_pool
+from utils import Config, base_header, create_pool, import_report
 
 
 async def start(testing: bool):
@@ -71,10 +72,29 @@ async def start(testing: bool):
         )
 
 
+def print_import_report():
+    modules = ["core", "utils"] + [
+        m.name for m in pkgutil.iter_modules(["./extensions"], prefix="extensions.")
+    ]
+
+    print(f"{'self [us]':>10} | {'cumulative':>10} | module")
+    for self_us, cumulative, name in import_report(modules):
+        print(f"{self_us:>10} | {cumulative:>10} | {name}")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--testing", "-t", required=False, default=False, type=bool)
+    parser.add_argument(
+        "--importtime",
+        action="store_true",
+        help="Show the slowest imports at startup (python -X importtime) and exit.",
+    )
 
     parsed = parser.parse_args()
 
+    if parsed.importtime:
+        print_import_report()
+        sys.exit(0)
+
     asyncio.run(start(parsed.testing))
@@ -24,6 +24,24 @@ CREATE TABLE IF NOT EXISTS user_settings (
 ALTER TABLE reminders ADD COLUMN IF NOT EXISTS timezone TEXT NOT NULL DEFAULT 'UTC';
 ALTER TABLE user_settings ADD COLUMN IF NOT EXISTS timezone TEXT NOT NULL DEFAULT 'UTC';
 
+ALTER TABLE reminders ADD COLUMN IF NOT EXISTS author_id BIGINT;
+ALTER TABLE reminders ADD COLUMN IF NOT EXISTS channel_id BIGINT;
+ALTER TABLE reminders ADD COLUMN IF NOT EXISTS message TEXT;
+
+-- reminders used to keep these in extra->'args'; the key is dropped once
+-- copied so this only ever matches rows that haven't been migrated yet
+UPDATE reminders
+SET author_id = (extra #>> '{args,0}')::BIGINT,
+    channel_id = (extra #>> '{args,1}')::BIGINT,
+    message = extra #>> '{args,2}',
+    extra = extra - 'args'
+WHERE event = 'reminder'
+  AND author_id IS NULL
+  AND extra ? 'args'
+  AND jsonb_array_length(extra -> 'args') >= 3;
+
+CREATE INDEX IF NOT EXISTS reminders_author_id_idx ON reminders (author_id, expires) WHERE event = 'reminder';
+
 CREATE TABLE IF NOT EXISTS plonks (
     id SERIAL PRIMARY KEY,
     guild_id BIGINT,
@@ -71,6 +89,22 @@ CREATE TABLE IF NOT EXISTS guild_icons (
     PRIMARY KEY(icon_key, guild_id)
 );
 
+-- images are kept in the blob store now, avatar and icon are the old webhook URLs
+ALTER TABLE avatars ADD COLUMN IF NOT EXISTS avatar_hash TEXT;
+ALTER TABLE guild_avatars ADD COLUMN IF NOT EXISTS avatar_hash TEXT;
+ALTER TABLE guild_icons ADD COLUMN IF NOT EXISTS icon_hash TEXT;
+
+-- what migrate_to_blobs pages through, these shrink to nothing once it's done
+CREATE INDEX IF NOT EXISTS avatars_unmigrated_idx ON avatars (id) WHERE avatar_hash IS NULL AND avatar IS NOT NULL;
+CREATE INDEX IF NOT EXISTS guild_avatars_unmigrated_idx ON guild_avatars (id) WHERE avatar_hash IS NULL AND avatar IS NOT NULL;
+CREATE INDEX IF NOT EXISTS guild_icons_unmigrated_idx ON guild_icons (id) WHERE icon_hash IS NULL AND icon IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS image_hashes (
+    digest TEXT PRIMARY KEY,
+    url TEXT,
+    created_at TIMESTAMP WITH TIME ZONE
+);
+
 CREATE TABLE IF NOT EXISTS username_logs (
     id SERIAL,
     user_id BIGINT,
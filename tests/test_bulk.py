@@ -0,0 +1,111 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+from discord.http import Route
+
+from utils.bulk import BulkExecutor, BulkResult, bucket_limit
+
+ROUTE = Route("PUT", "/guilds/{guild_id}/bans/{user_id}", guild_id=1, user_id=2)
+
+
+def http_error(status, reason):
+    response = SimpleNamespace(status=status, reason=reason)
+    return discord.HTTPException(response, "")  # type: ignore
+
+
+def make_executor(limit=None, **kwargs):
+    http = SimpleNamespace(_bucket_hashes={}, _buckets={})
+    if limit is not None:
+        http._bucket_hashes[ROUTE.key] = "hash"
+        http._buckets[f"hash:{ROUTE.major_parameters}"] = SimpleNamespace(limit=limit)
+    return BulkExecutor(SimpleNamespace(http=http), **kwargs)  # type: ignore
+
+
+class Tracker:
+    def __init__(self, fail=()):
+        self.fail = fail
+        self.running = 0
+        self.most = 0
+        self.seen = []
+
+    async def __call__(self, item):
+        self.running += 1
+        self.most = max(self.most, self.running)
+        try:
+            await asyncio.sleep(0.001)
+            self.seen.append(item)
+            if item in self.fail:
+                raise http_error(404, "Not Found")
+        finally:
+            self.running -= 1
+
+
+def test_bucket_limit():
+    assert bucket_limit(make_executor().bot.http, ROUTE) is None
+    assert bucket_limit(make_executor(limit=5).bot.http, ROUTE) == 5
+    # private state that isn't there at all counts as unknown
+    assert bucket_limit(SimpleNamespace(), ROUTE) is None  # type: ignore
+
+
+def test_collects_http_failures():
+    action = Tracker(fail={3, 7})
+    result = asyncio.run(make_executor().run(range(10), action))
+    assert sorted(result.succeeded) == [0, 1, 2, 4, 5, 6, 8, 9]
+    assert sorted(item for item, _ in result.failed) == [3, 7]
+    assert result.total == 10
+    assert result.describe_failures() == "2 404 Not Found"
+
+
+def test_describe_failures_counts_reasons():
+    result: BulkResult[int] = BulkResult()
+    result.failed = [
+        (1, http_error(404, "Not Found")),
+        (2, http_error(403, "Forbidden")),
+        (3, http_error(404, "Not Found")),
+    ]
+    assert result.describe_failures() == "2 404 Not Found, 1 403 Forbidden"
+
+
+def test_concurrency_is_capped():
+    action = Tracker()
+    asyncio.run(make_executor(max_concurrency=4).run(range(40), action))
+    assert action.most == 4
+    assert sorted(action.seen) == list(range(40))
+
+
+def test_one_at_a_time_keeps_order():
+    action = Tracker()
+    asyncio.run(make_executor().run(range(20), action, max_concurrency=1))
+    assert action.seen == list(range(20))
+
+
+@pytest.mark.parametrize("limit, expected", [(None, 1), (3, 3), (50, 10)])
+def test_route_concurrency_follows_the_bucket(limit, expected):
+    action = Tracker()
+    executor = make_executor(limit=limit)
+    asyncio.run(executor.run(range(40), action, route=ROUTE))
+    assert action.most == expected
+    assert sorted(action.seen) == list(range(40))
+
+
+def test_other_errors_stop_the_run():
+    async def action(item):
+        await asyncio.sleep(0.001)
+        if item == 5:
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(make_executor(max_concurrency=2).run(range(100), action))
+
+
+def test_progress():
+    updates = []
+
+    async def progress(done, total):
+        updates.append((done, total))
+
+    executor = make_executor(max_concurrency=1, progress_every=0)
+    asyncio.run(executor.run(range(5), Tracker(), progress=progress))
+    assert updates == [(n, 5) for n in range(1, 6)]
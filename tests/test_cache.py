@@ -0,0 +1,204 @@
+import asyncio
+import time
+
+import pytest
+
+import utils.cache
+from utils.cache import ExpiringCache, Strategy, cache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return time.perf_counter()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(utils.cache, "time", clock)
+    return clock
+
+
+def test_expiring_cache_expires(clock):
+    c = ExpiringCache(10)
+    c["a"] = 1
+    clock.now += 5
+    c["b"] = 2
+    assert c["a"] == 1
+    assert "a" in c
+
+    clock.now += 5
+    assert "a" not in c
+    with pytest.raises(KeyError):
+        c["a"]
+    assert c["b"] == 2
+    assert list(c) == ["b"]
+
+    clock.now += 5
+    assert len(c) == 0
+
+
+def test_expiring_cache_setting_again_restarts_ttl(clock):
+    c = ExpiringCache(10)
+    c["a"] = 1
+    c["b"] = 2
+    clock.now += 8
+    c["a"] = 3
+    clock.now += 5
+    assert list(c) == ["a"]
+    assert c["a"] == 3
+
+
+def test_expiring_cache_maxsize_evicts_oldest(clock):
+    evicted = []
+    c = ExpiringCache(10, 2, callback=lambda k, v: evicted.append((k, v)))
+    c["a"] = 1
+    c["b"] = 2
+    c["c"] = 3
+    assert list(c) == ["b", "c"]
+    assert evicted == [("a", 1)]
+
+    clock.now += 10
+    assert len(c) == 0
+    assert evicted == [("a", 1), ("b", 2), ("c", 3)]
+
+
+def test_expiring_cache_stats(clock):
+    c = ExpiringCache(10, 1)
+    c["a"] = 1
+    c["a"]
+    c.get("missing")
+    c["b"] = 2
+    clock.now += 10
+    c.get("b")
+    # only maxsize evictions count, expiring isn't one
+    assert c.get_stats() == (1, 2, 1)
+
+
+def test_timed_strategy_maxsize_is_the_ttl(clock):
+    @cache(maxsize=60, strategy=Strategy.timed)
+    async def unbounded(x):
+        return x
+
+    @cache(maxsize=2, strategy=Strategy.timed, ttl=60)
+    async def bounded(x):
+        return x
+
+    async def run():
+        for n in range(5):
+            await unbounded(n)
+            await bounded(n)
+
+    asyncio.run(run())
+    assert len(unbounded.cache) == 5
+    assert len(bounded.cache) == 2
+
+    clock.now += 60
+    assert len(unbounded.cache) == 0
+    assert len(bounded.cache) == 0
+
+
+def make_cached(**kwargs):
+    calls = []
+
+    @cache(**kwargs)
+    async def func(*args, **kw):
+        calls.append(args)
+        return args
+
+    return func, calls
+
+
+def test_cache_hits_and_invalidate():
+    func, calls = make_cached()
+
+    async def run():
+        await func(1, 2)
+        await func(1, 2)
+        assert calls == [(1, 2)]
+
+        assert func.invalidate(1, 2)
+        assert not func.invalidate(1, 2)
+        await func(1, 2)
+        assert calls == [(1, 2), (1, 2)]
+
+    asyncio.run(run())
+    assert (func.stats.hits, func.stats.misses) == (1, 2)
+
+
+def test_invalidate_containing_is_a_substring_match():
+    func, _ = make_cached()
+
+    async def run():
+        await func(123, "a")
+        await func(1234, "b")
+        await func(5, "c")
+        func.invalidate_containing("123")
+
+    asyncio.run(run())
+    assert list(func.cache.keys()) == [func.get_key(5, "c")]
+
+
+def test_invalidate_prefix_matches_leading_arguments():
+    func, _ = make_cached()
+
+    async def run():
+        await func(1, 2, 3)
+        await func(1, 2, 4)
+        await func(1, 3, 2)
+        await func(2, 1, 2)
+        func.invalidate_prefix(1, 2)
+        assert sorted(func.cache.keys()) == sorted(
+            [func.get_key(1, 3, 2), func.get_key(2, 1, 2)]
+        )
+
+        func.invalidate_prefix()
+        assert len(func.cache) == 0
+
+    asyncio.run(run())
+
+
+def test_eviction_drops_index_entries():
+    func, _ = make_cached(maxsize=2)
+
+    async def run():
+        for n in range(4):
+            await func(n)
+
+    asyncio.run(run())
+    assert len(func.cache) == 2
+    assert func.get_stats()[2] == 2
+
+    # evicted keys are gone from the index too, so invalidating them is a no-op
+    func.invalidate_prefix(0)
+    func.invalidate_prefix(3)
+    assert list(func.cache.keys()) == [func.get_key(2)]
+
+
+def test_failures_are_not_cached():
+    attempts = 0
+
+    @cache()
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError
+        return attempts
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await flaky()
+        # the done callback drops the failed task
+        await asyncio.sleep(0)
+        assert await flaky() == 2
+        assert await flaky() == 2
+
+    asyncio.run(run())
+    assert flaky.stats.failures == 1
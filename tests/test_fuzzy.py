@@ -0,0 +1,87 @@
+import random
+import string
+
+import pytest
+
+from utils import fuzzy
+from utils.fuzzy import FuzzyIndex
+
+random.seed(0)
+# the index holds each item once, so the corpus has no duplicates
+WORDS = list(
+    dict.fromkeys(
+        "".join(random.choices(string.ascii_letters + " _-", k=random.randint(1, 16)))
+        for _ in range(500)
+    )
+) + ["Asia/Tokyo", "America/New_York", "Europe/London", "tokyo", "New York"]
+QUERIES = ["", "t", "ok", "tok", "new y", "NY", "lond", "zz_", "a b", "xq"]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return FuzzyIndex(WORDS)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_finder_matches_linear_scan(index, query):
+    assert index.finder(query) == fuzzy.finder(query, WORDS)
+    assert index.finder(query, raw=True) == fuzzy.finder(query, WORDS, raw=True)
+
+
+@pytest.mark.parametrize("query", QUERIES[1:])
+@pytest.mark.parametrize("scorer", [fuzzy.quick_ratio, fuzzy.ratio])
+@pytest.mark.parametrize("limit", [1, 10, None])
+def test_extract_matches_linear_scan(index, query, scorer, limit):
+    expected = fuzzy.extract(query, WORDS, scorer=scorer, score_cutoff=40, limit=limit)
+    got = index.extract(query, scorer=scorer, score_cutoff=40, limit=limit)
+    assert got == expected
+
+
+def test_key_and_membership():
+    index = FuzzyIndex([("Tokyo", 1), ("London", 2)], key=lambda t: t[0])
+    assert index.finder("lon") == [("London", 2)]
+    assert ("Tokyo", 1) in index
+    assert len(index) == 2
+
+
+def test_add_and_remove():
+    index = FuzzyIndex(["tokyo", "kyoto"])
+    index.add("tokyo")
+    assert len(index) == 2
+
+    index.remove("tokyo")
+    assert index.finder("tok") == []
+    assert index.finder("kyo") == ["kyoto"]
+    # nothing is left pointing at the removed entry
+    assert all(ids <= index._entries.keys() for ids in index._pairs.values())
+
+    index.add("tokyo")
+    assert index.finder("tok") == ["tokyo"]
+
+
+def test_search_falls_back_to_trigrams():
+    index = FuzzyIndex(["Europe/London", "Asia/Tokyo"])
+    # no subsequence match because of the typo, but most trigrams are shared
+    assert index.finder("londno") == []
+    assert index.search("londno") == ["Europe/London"]
+
+
+def test_search_limit():
+    index = FuzzyIndex([f"item {n}" for n in range(50)])
+    assert len(index.search("item", limit=5)) == 5
+
+
+def test_dict_round_trip(index):
+    restored = FuzzyIndex.from_dict(index.to_dict())
+    assert list(restored) == list(index)
+    for query in QUERIES:
+        assert restored.finder(query) == index.finder(query)
+    assert restored.extract("tok") == index.extract("tok")
+
+    restored.add("brand new")
+    assert restored.finder("brand") == ["brand new"]
+
+
+def test_to_dict_needs_plain_strings():
+    with pytest.raises(TypeError):
+        FuzzyIndex(["a"], key=str.upper).to_dict()
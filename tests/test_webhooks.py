@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import pytest
+
+from utils.webhooks import WebhookBucket, WebhookPool
+
+
+def make_pool(*urls, session=None):
+    return WebhookPool(session, urls)  # type: ignore
+
+
+def test_budget_falls_back_to_default():
+    bucket = WebhookBucket("a")
+    now = time.monotonic()
+    assert bucket.budget(now) == WebhookPool.DEFAULT_BUDGET
+
+    bucket.in_flight = 2
+    assert bucket.budget(now) == WebhookPool.DEFAULT_BUDGET - 2
+
+    bucket.remaining = 1
+    bucket.reset_at = now + 10
+    assert bucket.budget(now) == -1
+
+    # once the window has passed the old count doesn't apply anymore
+    assert bucket.budget(now + 10) == WebhookPool.DEFAULT_BUDGET - 2
+
+
+def test_acquire_picks_the_most_budget():
+    pool = make_pool("a", "b", "c")
+    now = time.monotonic()
+    a, b, c = pool.buckets
+    a.remaining, a.reset_at = 1, now + 10
+    b.remaining, b.reset_at = 4, now + 10
+    c.remaining, c.reset_at = 2, now + 10
+
+    async def run():
+        return [(await pool._acquire()).url for _ in range(4)]
+
+    # in_flight counts against the budget, so b is picked until it's level
+    # with c, then they share and a never gets one
+    picked = asyncio.run(run())
+    assert picked[:2] == ["b", "b"]
+    assert sorted(picked[2:]) == ["b", "c"]
+
+
+def test_acquire_spreads_ties():
+    pool = make_pool("a", "b")
+    seen = set()
+
+    async def run():
+        for _ in range(50):
+            bucket = await pool._acquire()
+            seen.add(bucket.url)
+            bucket.in_flight -= 1
+
+    asyncio.run(run())
+    assert seen == {"a", "b"}
+
+
+def test_acquire_waits_for_a_reset():
+    pool = make_pool("a", "b")
+    now = time.monotonic()
+    a, b = pool.buckets
+    a.remaining, a.reset_at = 0, now + 0.2
+    b.remaining, b.reset_at = 0, now + 5
+
+    async def run():
+        bucket = await asyncio.wait_for(pool._acquire(), 2)
+        return bucket.url, time.monotonic() - now
+
+    url, waited = asyncio.run(run())
+    assert url == "a"
+    assert waited >= 0.15
+
+
+class FakeResponse:
+    def __init__(self, status, body, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def json(self):
+        return self.body
+
+    async def text(self):
+        return str(self.body)
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = responses
+        self.posted = []
+
+    def post(self, url, **kwargs):
+        self.posted.append(url)
+        return self.responses[url].pop(0)
+
+
+@pytest.mark.parametrize("is_global", [False, True])
+def test_upload_moves_on_after_a_429(is_global):
+    ok = {"attachments": [{"url": "https://cdn/file.png"}]}
+    limited = {"retry_after": 0.1, "global": is_global}
+    session = FakeSession(
+        {
+            "a": [FakeResponse(429, limited), FakeResponse(200, ok)],
+            "b": [FakeResponse(200, ok)],
+        }
+    )
+    pool = make_pool("a", "b", session=session)
+    pool.buckets[1].remaining, pool.buckets[1].reset_at = 1, time.monotonic() + 10
+
+    url = asyncio.run(pool.upload("", b"data", "file.png"))
+    assert url == "https://cdn/file.png"
+    assert pool.buckets[0].rate_limited == 1
+    assert all(bucket.in_flight == 0 for bucket in pool.buckets)
+    assert session.posted[0] == "a"
+    if is_global:
+        # everything waited out the limit, either one can take the retry
+        assert len(session.posted) == 2
+    else:
+        assert session.posted == ["a", "b"]
+
+
+def test_upload_without_webhooks():
+    assert asyncio.run(make_pool().upload("", b"", "x")) is None
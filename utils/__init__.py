@@ -1,3 +1,5 @@
+from .blobs import *
+from .bulk import *
 from .checks import *
 from .converters import *
 from .downloads import *
@@ -6,9 +8,20 @@ from .errors import *
 from .formats import *
 from .functions import *
 from .fuzzy import *
+from .http import *
+from .images import *
+from .imports import *
+from .ingest import *
+from .keys import *
 from .paginator import *
 from .regexes import *
+from .settings import *
+from .spotify import *
+from .tenor import *
+from .thumbnails import *
 from .time import *
+from .twemoji import *
 from .types import *
 from .vars import *
 from .views import *
+from .webhooks import *
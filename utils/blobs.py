@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import abc
+import asyncio
+import hashlib
+import os
+from io import BytesIO
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Optional, Tuple
+
+import asyncpg
+import discord
+
+if TYPE_CHECKING:
+    from core import Fishie
+
+BLOB_ROOT = "files/blobs"
+
+
+def blob_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def blob_extension(data: bytes) -> str:
+    """Guesses a file extension from the first few bytes of an image."""
+    if data[:4] == b"GIF8":
+        return "gif"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return "bin"
+
+
+class BlobBackend(abc.ABC):
+    """Where the blob store actually keeps things, blobs are addressed by digest."""
+
+    @abc.abstractmethod
+    async def exists(self, digest: str) -> bool: ...
+
+    @abc.abstractmethod
+    async def read(self, digest: str) -> Optional[bytes]: ...
+
+    @abc.abstractmethod
+    async def write(self, digest: str, data: bytes) -> None: ...
+
+
+class LocalBlobBackend(BlobBackend):
+    """Keeps blobs on disk as ``root/ab/cd/abcd...``.
+
+    Sharding by the first bytes of the digest keeps any one directory from
+    growing to hundreds of thousands of files.
+    """
+
+    def __init__(self, root: str = BLOB_ROOT):
+        self.root = root
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    async def exists(self, digest: str) -> bool:
+        return await asyncio.to_thread(os.path.exists, self.path(digest))
+
+    @staticmethod
+    def _read(path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as fp:
+                return fp.read()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fp:
+            fp.write(data)
+        os.replace(tmp, path)
+
+    async def read(self, digest: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, self.path(digest))
+
+    async def write(self, digest: str, data: bytes) -> None:
+        await asyncio.to_thread(self._write, self.path(digest), data)
+
+
+class BlobStore:
+    """Content addressed storage for logged images.
+
+    Blobs are keyed by the SHA-256 of their bytes, so storing the same image
+    twice (a user switching back to an old avatar, two members with the same
+    server avatar) only keeps one copy.
+    """
+
+    def __init__(self, backend: BlobBackend):
+        self.backend = backend
+        self.stats: Dict[str, int] = {"stored": 0, "deduplicated": 0, "read": 0}
+
+    async def put(self, data: bytes) -> str:
+        digest = blob_digest(data)
+        if await self.backend.exists(digest):
+            self.stats["deduplicated"] += 1
+            return digest
+
+        await self.backend.write(digest, data)
+        self.stats["stored"] += 1
+        return digest
+
+    async def get(self, digest: str) -> Optional[bytes]:
+        data = await self.backend.read(digest)
+        if data is not None:
+            self.stats["read"] += 1
+        return data
+
+    async def file(self, digest: str, name: str) -> Optional[discord.File]:
+        """The blob as an upload named ``name`` plus a guessed extension."""
+        data = await self.get(digest)
+        if data is None:
+            return None
+        return discord.File(BytesIO(data), f"{name}.{blob_extension(data)}")
+
+
+class ImageIndex:
+    """Postgres index of every image put in the blob store.
+
+    Looked up before any work is done on a new image, so an image that was
+    already stored is recorded as a reference to the existing blob and
+    webhook copy.
+    """
+
+    def __init__(self, bot: Fishie):
+        self.bot = bot
+        self.stats: Dict[str, int] = {"exact": 0, "new": 0}
+
+    async def find(self, digest: str) -> Optional[asyncpg.Record]:
+        record = await self.bot.pool.fetchrow(
+            "SELECT * FROM image_hashes WHERE digest = $1", digest
+        )
+        if record is not None:
+            self.stats["exact"] += 1
+        return record
+
+    async def add(self, digest: str, *, url: Optional[str] = None) -> None:
+        await self.bot.pool.execute(
+            """INSERT INTO image_hashes (digest, url, created_at)
+            VALUES ($1, $2, NOW())
+            ON CONFLICT (digest) DO UPDATE
+            SET url = COALESCE(image_hashes.url, EXCLUDED.url)""",
+            digest,
+            url,
+        )
+        self.stats["new"] += 1
+
+    async def store(
+        self,
+        data: bytes,
+        mirror: Optional[Callable[[], Awaitable[Optional[str]]]] = None,
+    ) -> Tuple[str, Optional[str]]:
+        """Stores an image unless it's already known, returns (digest, webhook URL).
+
+        ``mirror`` uploads the image to a webhook and is only called for new images.
+        """
+        digest = blob_digest(data)
+        known = await self.find(digest)
+        if known is not None:
+            return digest, known["url"]
+
+        await self.bot.blobs.put(data)
+        url = await mirror() if mirror is not None else None
+        await self.add(digest, url=url)
+        return digest, url
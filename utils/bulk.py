@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+import discord
+from discord.http import HTTPClient, Route
+
+if TYPE_CHECKING:
+    from core import Fishie
+
+__all__ = ("bucket_limit", "BulkResult", "BulkExecutor")
+
+T = TypeVar("T")
+
+
+def bucket_limit(http: HTTPClient, route: Route) -> Optional[int]:
+    """How many requests per window discord.py has seen the route's bucket allow.
+
+    None until a request on the route has come back with rate limit headers.
+    """
+    # private discord.py state, treated as unknown if it ever moves
+    bucket_hash = getattr(http, "_bucket_hashes", {}).get(route.key)
+    if bucket_hash is None:
+        return None
+
+    bucket = getattr(http, "_buckets", {}).get(
+        f"{bucket_hash}:{route.major_parameters}"
+    )
+    return getattr(bucket, "limit", None)
+
+
+class BulkResult(Generic[T]):
+    __slots__ = ("succeeded", "failed", "elapsed")
+
+    def __init__(self):
+        self.succeeded: List[T] = []
+        self.failed: List[Tuple[T, discord.HTTPException]] = []
+        self.elapsed = 0.0
+
+    @property
+    def total(self) -> int:
+        return len(self.succeeded) + len(self.failed)
+
+    def describe_failures(self) -> str:
+        """e.g. ``2 Not Found, 1 Forbidden``"""
+        reasons = Counter(
+            f"{e.status} {e.response.reason}" if e.response else str(e)
+            for _, e in self.failed
+        )
+        return ", ".join(f"{count} {reason}" for reason, count in reasons.most_common())
+
+
+class BulkExecutor:
+    """Runs the same REST call over a lot of items as fast as the rate limits allow.
+
+    discord.py already waits out each route's bucket, so the only thing left
+    is keeping as many requests in flight as the bucket takes per window.
+    Given the route, one request goes out first to learn the bucket's limit
+    from its headers, then that many run at once (capped at
+    ``max_concurrency``). Requests failing with an HTTP error are collected
+    into the result rather than stopping the rest, any other exception
+    cancels the run and propagates.
+    """
+
+    def __init__(
+        self, bot: Fishie, *, max_concurrency: int = 10, progress_every: float = 2.0
+    ):
+        self.bot = bot
+        self.max_concurrency = max_concurrency
+        self.progress_every = progress_every
+
+    async def run(
+        self,
+        items: Sequence[T],
+        action: Callable[[T], Awaitable[Any]],
+        *,
+        route: Optional[Route] = None,
+        max_concurrency: Optional[int] = None,
+        progress: Optional[Callable[[int, int], Awaitable[Any]]] = None,
+    ) -> BulkResult[T]:
+        """Calls ``action`` on every item.
+
+        ``progress`` gets (done, total) at most every ``progress_every``
+        seconds. ``max_concurrency=1`` keeps the items in order.
+        """
+        result: BulkResult[T] = BulkResult()
+        cap = max_concurrency or self.max_concurrency
+        pending: Iterator[T] = iter(items)
+        workers: List[asyncio.Task[None]] = []
+        start = last_progress = time.monotonic()
+        updating = False
+
+        def target() -> int:
+            if route is None:
+                return cap
+            return min(cap, bucket_limit(self.bot.http, route) or 1)
+
+        async def worker():
+            nonlocal last_progress, updating
+            # items are handed out one at a time, next() never awaits
+            for item in pending:
+                try:
+                    await action(item)
+                except discord.HTTPException as e:
+                    result.failed.append((item, e))
+                else:
+                    result.succeeded.append(item)
+
+                if route is not None:
+                    while len(workers) < target():
+                        workers.append(asyncio.create_task(worker()))
+
+                now = time.monotonic()
+                if (
+                    progress is not None
+                    and not updating
+                    and now - last_progress >= self.progress_every
+                ):
+                    updating = True
+                    last_progress = now
+                    try:
+                        await progress(result.total, len(items))
+                    except discord.HTTPException:
+                        pass
+                    finally:
+                        updating = False
+
+        workers.append(asyncio.create_task(worker()))
+        if route is None:
+            while len(workers) < min(cap, len(items)):
+                workers.append(asyncio.create_task(worker()))
+
+        try:
+            # workers can start more workers while these are awaited
+            index = 0
+            while index < len(workers):
+                await workers[index]
+                index += 1
+        finally:
+            for task in workers:
+                task.cancel()
+
+        result.elapsed = time.monotonic() - start
+        return result
@@ -2,11 +2,28 @@ from __future__ import annotations
 
 import asyncio
 import enum
+import json
+import logging
 import time
-from functools import wraps
-from typing import Any, Callable, Coroutine, MutableMapping, Protocol, TypeVar
+from collections import OrderedDict
+from functools import partial, wraps
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Iterator,
+    MutableMapping,
+    Optional,
+    Protocol,
+    TypeVar,
+)
 
 from lru import LRU
+from redis.exceptions import RedisError
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
 
 R = TypeVar("R")
 
@@ -23,33 +40,183 @@ class CacheProtocol(Protocol[R]):
 
     def invalidate_containing(self, key: str) -> None: ...
 
-    def get_stats(self) -> tuple[int, int]: ...
+    def invalidate_prefix(self, *args: Any) -> None: ...
+
+    stats: CacheStats
+
+    def get_stats(self) -> tuple[int, int, int]: ...
 
 
-class ExpiringCache(dict):
-    def __init__(self, seconds: float):
+class ExpiringCache(MutableMapping[str, Any]):
+    """A mapping whose entries expire a fixed number of seconds after being set.
+
+    Every entry has the same TTL so insertion order is also expiry order,
+    expired entries are popped off the front as they're found instead of
+    scanning the whole cache on each read.
+    """
+
+    def __init__(
+        self,
+        seconds: float,
+        maxsize: Optional[int] = None,
+        callback: Optional[Callable[[str, Any], None]] = None,
+    ):
         self.__ttl: float = seconds
-        super().__init__()
+        self.__maxsize: Optional[int] = maxsize
+        # called with (key, value) when an entry expires or is evicted, like LRU's
+        self.__callback = callback
+        # key -> (value, expires at), oldest first
+        self.__data: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __purge_expired(self, now: float) -> None:
+        data = self.__data
+        while data:
+            key, (value, expires) = next(iter(data.items()))
+            if expires > now:
+                break
+            del data[key]
+            if self.__callback is not None:
+                self.__callback(key, value)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            _, expires = self.__data[key]  # type: ignore
+        except KeyError:
+            return False
+
+        now = time.monotonic()
+        if expires <= now:
+            self.__purge_expired(now)
+            return False
+        return True
+
+    def __getitem__(self, key: str) -> Any:
+        now = time.monotonic()
+        try:
+            value, expires = self.__data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+
+        if expires <= now:
+            self.__purge_expired(now)
+            self.misses += 1
+            raise KeyError(key)
+
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        now = time.monotonic()
+        data = self.__data
+        data[key] = (value, now + self.__ttl)
+        data.move_to_end(key)
+
+        self.__purge_expired(now)
+        if self.__maxsize is not None:
+            while len(data) > self.__maxsize:
+                key, (value, _) = data.popitem(last=False)
+                self.evictions += 1
+                if self.__callback is not None:
+                    self.__callback(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        del self.__data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        self.__purge_expired(time.monotonic())
+        return iter(list(self.__data))
+
+    def __len__(self) -> int:
+        self.__purge_expired(time.monotonic())
+        return len(self.__data)
+
+    def get_stats(self) -> tuple[int, int, int]:
+        """Returns (hits, misses, evictions), expired entries aren't evictions."""
+        return self.hits, self.misses, self.evictions
+
+
+_log = logging.getLogger(__name__)
+
+# shared second tier for cache(shared_ttl=...), set once Redis is connected
+_redis: Optional[Redis] = None
+
+# Redis deletes started by invalidations, referenced until they finish
+_pending_deletes: set[asyncio.Task[None]] = set()
+
+# how long a process computing a shared miss holds the lock, in seconds
+SHARED_LOCK_TIMEOUT = 10.0
 
-    def __verify_cache_integrity(self):
-        # Have to do this in two steps...
-        current_time = time.monotonic()
-        to_remove = [
-            k for (k, (v, t)) in self.items() if current_time > (t + self.__ttl)
-        ]
-        for k in to_remove:
-            del self[k]
 
-    def __contains__(self, key: str):
-        self.__verify_cache_integrity()
-        return super().__contains__(key)
+def set_redis(redis: Optional[Redis]) -> None:
+    global _redis
+    _redis = redis
 
-    def __getitem__(self, key: str):
-        self.__verify_cache_integrity()
-        return super().__getitem__(key)
 
-    def __setitem__(self, key: str, value: Any):
-        super().__setitem__(key, (value, time.monotonic()))
+async def _delete_shared(redis: Redis, key: str) -> None:
+    try:
+        await redis.delete(key)
+    except RedisError as e:
+        # the copy expires by itself, other processes may see it until then
+        _log.warning(f"Couldn't remove {key} from the shared cache: {e}")
+
+
+class CacheStats:
+    __slots__ = (
+        "hits",
+        "misses",
+        "shared_hits",
+        "shared_misses",
+        "failures",
+        "refreshes",
+        "latency",
+    )
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        # local misses answered (or not) by Redis
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.failures = 0
+        self.refreshes = 0
+        # total seconds spent computing misses
+        self.latency = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def shared_hit_ratio(self) -> float:
+        total = self.shared_hits + self.shared_misses
+        return self.shared_hits / total if total else 0.0
+
+    @property
+    def average_latency(self) -> float:
+        return self.latency / self.misses if self.misses else 0.0
+
+
+# qualified function name -> stats, for every function using cache()
+_stats_registry: dict[str, CacheStats] = {}
+
+
+def get_cache_stats() -> dict[str, CacheStats]:
+    return _stats_registry
+
+
+class _Entry:
+    __slots__ = ("parts", "task", "created", "refreshing")
+
+    def __init__(self, parts: tuple[str, ...], task: asyncio.Task[Any]):
+        self.parts = parts
+        self.task = task
+        self.created = time.monotonic()
+        self.refreshing = False
 
 
 class Strategy(enum.Enum):
@@ -62,19 +229,68 @@ def cache(
     maxsize: int = 128,
     strategy: Strategy = Strategy.lru,
     ignore_kwargs: bool = False,
+    ttl: Optional[float] = None,
+    failure_ttl: float = 0.0,
+    refresh_after: Optional[float] = None,
+    shared_ttl: Optional[int] = None,
 ) -> Callable[[Callable[..., Coroutine[Any, Any, R]]], CacheProtocol[R]]:
+    """Caches the task of a coroutine function by its arguments.
+
+    With ``Strategy.timed``, ``maxsize`` is how many seconds entries live for
+    unless ``ttl`` is given, in which case ``maxsize`` bounds the entry count.
+
+    Failed calls are kept for ``failure_ttl`` seconds before being retried.
+    With ``refresh_after`` set, hits older than that return the cached value
+    and recompute it in the background.
+
+    With ``shared_ttl`` set, results are also kept in Redis for that many
+    seconds so other processes and restarts can use them. They have to be
+    JSON serialisable, and come back as JSON types (tuples become lists).
+    Invalidating removes the Redis copy, but other processes keep their
+    local one until it's evicted.
+    """
+
     def decorator(func: Callable[..., Coroutine[Any, Any, R]]) -> CacheProtocol[R]:
+        prefix = f"{func.__module__}.{func.__name__}"
+        stats = _stats_registry[f"{func.__module__}.{func.__qualname__}"] = CacheStats()
+        # key -> entry, and each key component -> the keys it's part of
+        _entries: dict[str, _Entry] = {}
+        _index: dict[str, set[str]] = {}
+        evictions = 0
+
+        def _forget(key: str) -> None:
+            entry = _entries.pop(key, None)
+            if entry is None:
+                return
+
+            # parts can repeat, the index only holds each one once
+            for part in set(entry.parts):
+                keys = _index[part]
+                keys.discard(key)
+                if not keys:
+                    del _index[part]
+
+        def _evicted(key: str, _: Any) -> None:
+            nonlocal evictions
+            evictions += 1
+            _forget(key)
+
         if strategy is Strategy.lru:
-            _internal_cache = LRU(maxsize)
-            _stats = _internal_cache.get_stats
+            _internal_cache = LRU(maxsize, callback=_evicted)
+            _stats = lambda: (*_internal_cache.get_stats(), evictions)
         elif strategy is Strategy.raw:
             _internal_cache = {}
-            _stats = lambda: (0, 0)
+            _stats = lambda: (0, 0, 0)
         elif strategy is Strategy.timed:
-            _internal_cache = ExpiringCache(maxsize)
-            _stats = lambda: (0, 0)
+            # expired entries go through the callback too, but aren't evictions
+            _internal_cache = (
+                ExpiringCache(maxsize, callback=lambda key, _: _forget(key))
+                if ttl is None
+                else ExpiringCache(ttl, maxsize, callback=lambda key, _: _forget(key))
+            )
+            _stats = _internal_cache.get_stats
 
-        def _make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+        def _make_parts(args: tuple[Any, ...], kwargs: dict[str, Any]) -> list[str]:
             # this is a bit of a cluster fuck
             # we do care what 'self' parameter is when we __repr__ it
             def _true_repr(o):
@@ -82,8 +298,7 @@ def cache(
                     return f"<{o.__class__.__module__}.{o.__class__.__name__}>"
                 return repr(o)
 
-            key = [f"{func.__module__}.{func.__name__}"]
-            key.extend(_true_repr(o) for o in args)
+            parts = [_true_repr(o) for o in args]
             if not ignore_kwargs:
                 for k, v in kwargs.items():
                     # note: this only really works for this use case in particular
@@ -93,46 +308,181 @@ def cache(
                     if k == "connection" or k == "pool":
                         continue
 
-                    key.append(_true_repr(k))
-                    key.append(_true_repr(v))
+                    parts.append(_true_repr(k))
+                    parts.append(_true_repr(v))
+
+            return parts
+
+        def _make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+            return ":".join([prefix, *_make_parts(args, kwargs)])
+
+        async def _call(
+            key: str, args: tuple[Any, ...], kwargs: dict[str, Any], *, refresh: bool
+        ) -> Any:
+            redis = _redis
+            if shared_ttl is None or redis is None:
+                return await func(*args, **kwargs)
+
+            shared_key = f"cache:{key}"
+            lock_key = f"{shared_key}:lock"
+            locked = False
+            try:
+                if not refresh:
+                    deadline = time.monotonic() + SHARED_LOCK_TIMEOUT
+                    while True:
+                        cached = await redis.get(shared_key)
+                        if cached is not None:
+                            stats.shared_hits += 1
+                            return json.loads(cached)
+
+                        # only one process computes a miss, the rest wait for it
+                        locked = await redis.set(
+                            lock_key, "1", nx=True, px=int(SHARED_LOCK_TIMEOUT * 1000)
+                        )
+                        if locked:
+                            break
+
+                        if time.monotonic() > deadline:
+                            break
 
-            return ":".join(key)
+                        await asyncio.sleep(0.05)
+
+                    stats.shared_misses += 1
+            except RedisError as e:
+                _log.warning(f"Shared cache unavailable for {prefix}: {e}")
+                return await func(*args, **kwargs)
+
+            try:
+                result = await func(*args, **kwargs)
+                try:
+                    await redis.set(shared_key, json.dumps(result), ex=shared_ttl)
+                except (TypeError, ValueError):
+                    _log.warning(f"Can't share the result of {prefix}, not JSON")
+                except RedisError as e:
+                    _log.warning(f"Shared cache unavailable for {prefix}: {e}")
+                return result
+            finally:
+                if locked:
+                    try:
+                        await redis.delete(lock_key)
+                    except RedisError:
+                        pass
+
+        def _remove(key: str) -> bool:
+            _forget(key)
+            if shared_ttl is not None and _redis is not None:
+                try:
+                    task = asyncio.get_running_loop().create_task(
+                        _delete_shared(_redis, f"cache:{key}")
+                    )
+                except RuntimeError:
+                    # no loop to schedule it on, it'll expire by itself
+                    pass
+                else:
+                    _pending_deletes.add(task)
+                    task.add_done_callback(_pending_deletes.discard)
+            try:
+                del _internal_cache[key]
+            except KeyError:
+                return False
+            else:
+                return True
+
+        def _finished(key: str, started: float, task: asyncio.Task[Any]) -> None:
+            stats.latency += time.perf_counter() - started
+            if not task.cancelled() and task.exception() is None:
+                return
+
+            stats.failures += 1
+
+            def _drop():
+                entry = _entries.get(key)
+                if entry is not None and entry.task is task:
+                    _remove(key)
+
+            if failure_ttl > 0:
+                asyncio.get_running_loop().call_later(failure_ttl, _drop)
+            else:
+                _drop()
+
+        def _refresh(
+            key: str, entry: _Entry, args: tuple[Any, ...], kwargs: dict[str, Any]
+        ) -> None:
+            entry.refreshing = True
+            stats.refreshes += 1
+
+            def _refreshed(task: asyncio.Task[Any]) -> None:
+                entry.refreshing = False
+                if task.cancelled() or task.exception() is not None:
+                    # keep serving the stale value
+                    stats.failures += 1
+                    return
+
+                if _entries.get(key) is entry:
+                    _internal_cache[key] = entry.task = task
+                    entry.created = time.monotonic()
+
+            task = asyncio.create_task(_call(key, args, kwargs, refresh=True))
+            task.add_done_callback(_refreshed)
 
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any):
-            key = _make_key(args, kwargs)
+            parts = _make_parts(args, kwargs)
+            key = ":".join([prefix, *parts])
             try:
                 task = _internal_cache[key]
             except KeyError:
-                _internal_cache[key] = task = asyncio.create_task(func(*args, **kwargs))
-                return task
-            else:
+                stats.misses += 1
+                task = asyncio.create_task(_call(key, args, kwargs, refresh=False))
+                _forget(key)
+                _entries[key] = _Entry(tuple(parts), task)
+                for part in set(parts):
+                    _index.setdefault(part, set()).add(key)
+                _internal_cache[key] = task
+                task.add_done_callback(partial(_finished, key, time.perf_counter()))
                 return task
 
+            stats.hits += 1
+            entry = _entries.get(key)
+            if (
+                refresh_after is not None
+                and entry is not None
+                and not entry.refreshing
+                and task.done()
+                and time.monotonic() - entry.created > refresh_after
+            ):
+                _refresh(key, entry, args, kwargs)
+
+            return task
+
         def _invalidate(*args: Any, **kwargs: Any) -> bool:
-            try:
-                del _internal_cache[_make_key(args, kwargs)]
-            except KeyError:
-                return False
-            else:
-                return True
+            return _remove(_make_key(args, kwargs))
 
         def _invalidate_containing(key: str) -> None:
-            to_remove = []
-            for k in _internal_cache.keys():
-                if key in k:
-                    to_remove.append(k)
-            for k in to_remove:
-                try:
-                    del _internal_cache[k]
-                except KeyError:
-                    continue
+            # plain substring match against the full key, so this stays a scan;
+            # invalidate_prefix goes through the component index instead
+            for k in [k for k in _entries if key in k]:
+                _remove(k)
+
+        def _invalidate_prefix(*args: Any) -> None:
+            parts = _make_parts(args, {})
+            if not parts:
+                for k in list(_entries):
+                    _remove(k)
+                return
+
+            candidates = min((_index.get(p, set()) for p in parts), key=len)
+            for k in list(candidates):
+                if _entries[k].parts[: len(parts)] == tuple(parts):
+                    _remove(k)
 
         wrapper.cache = _internal_cache  # type: ignore
         wrapper.get_key = lambda *args, **kwargs: _make_key(args, kwargs)  # type: ignore
         wrapper.invalidate = _invalidate  # type: ignore
         wrapper.get_stats = _stats  # type: ignore
         wrapper.invalidate_containing = _invalidate_containing  # type: ignore
+        wrapper.invalidate_prefix = _invalidate_prefix  # type: ignore
+        wrapper.stats = stats  # type: ignore
         return wrapper  # type: ignore
 
     return decorator
@@ -3,15 +3,19 @@ from __future__ import annotations
 import secrets
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
-import yt_dlp
 from discord.ext import commands
 
 from .errors import DownloadError, InvalidWebsite, VideoIsLive
 from .functions import to_thread
+from .imports import lazy_import
 from .regexes import SOUNDCLOUD_RE, TIKTOK_RE, TWITTER_RE, VIDEOS_RE
 
 if TYPE_CHECKING:
+    import yt_dlp
+
     from core import Fishie
+else:
+    yt_dlp = lazy_import("yt_dlp")
 
 
 def match_filter(info: Dict[Any, Any]):
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import asyncio
+import csv
+import hashlib
 import json
 import logging
 import math
+import os
 import textwrap
-from io import BytesIO
+from io import BytesIO, StringIO
 from typing import (
+    IO,
     TYPE_CHECKING,
     Any,
     Awaitable,
     Callable,
+    Dict,
     List,
     Optional,
     Sequence,
@@ -21,16 +26,22 @@ from typing import (
 import aiohttp
 import asyncpg
 import discord
-import pandas as pd
 from aiohttp import ClientResponse
 from discord.ext import commands
-from PIL import Image, ImageSequence
 
+from . import cache
+from .http import CachedResponse
+from .imports import lazy_import
 from .types import P, T
 from .vars import USER_FLAGS
 
 if TYPE_CHECKING:
+    from PIL import Image, ImageSequence
+
     from core import Fishie
+else:
+    Image = lazy_import("PIL.Image")
+    ImageSequence = lazy_import("PIL.ImageSequence")
 
 
 def to_thread(func: Callable[P, T]) -> Callable[P, Awaitable[T]]:
@@ -85,7 +96,7 @@ def human_join(seq: Sequence[str], delim=", ", final="or", spaces: bool = True)
     return delim.join(seq[:-1]) + f"{final}{seq[-1]}"
 
 
-def response_checker(response: ClientResponse) -> bool:
+def response_checker(response: Union[ClientResponse, CachedResponse]) -> bool:
     if response.status == 200:
         return True
 
@@ -115,43 +126,28 @@ def response_checker(response: ClientResponse) -> bool:
     )
 
 
-async def get_sp_cover(bot: Fishie, query: str) -> Tuple[str, bool]:
-    results = bot.cached_covers.get(query)
-
-    if results:
-        return results
-
-    if bot.spotify_key is None:
-        raise commands.BadArgument(
-            "Spotify key is not set yet, maybe spotify cog needs loaded?"
-        )
-
-    url = "https://api.spotify.com/v1/search"
-
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {bot.spotify_key}",
-    }
-
+@cache.cache(maxsize=1024, shared_ttl=86400)
+async def search_sp_album(bot: Fishie, query: str) -> Tuple[str, str]:
+    """Returns the ID and cover URL of the first album found for the query."""
     data = {"q": query, "type": "album", "limit": "1"}
-
-    async with bot.session.get(url, headers=headers, params=data) as r:
-        results = await r.json()
+    r = await bot.spotify.get("search", params=data)
+    response_checker(r)
+    results = r.json()
 
     try:
-        cover = results["albums"]["items"][0]["images"][0]["url"]
-        nsfw = results["albums"]["items"][0]["id"] in await bot.redis.smembers("nsfw_covers")  # type: ignore
-
-        try:
-            bot.cached_covers[query] = (cover, nsfw)
-        except KeyError:
-            pass
-
-        return cover, nsfw
+        album = results["albums"]["items"][0]
+        return album["id"], album["images"][0]["url"]
     except (IndexError, KeyError):
         raise commands.BadArgument("No cover found for this album, sorry.")
 
 
+async def get_sp_cover(bot: Fishie, query: str) -> Tuple[str, bool]:
+    # the album is cached, whether it's nsfw isn't since the set can change
+    album_id, cover = await search_sp_album(bot, " ".join(query.lower().split()))
+    nsfw = await bot.redis.sismember("nsfw_covers", album_id)  # type: ignore
+    return cover, bool(nsfw)
+
+
 async def to_image(
     session: aiohttp.ClientSession,
     url: str,
@@ -167,60 +163,79 @@ async def to_image(
         return data if bytes else BytesIO(data)
 
 
-# https://github.com/CuteFwan/Koishi/blob/master/cogs/utils/images.py#L4-L34
-def resize_to_limit(data: BytesIO, limit: int) -> BytesIO:
+# encoded size roughly follows the pixel count, aim a little under the limit
+# so the first estimate usually fits
+DOWNSCALE_MARGIN = 0.95
+
+
+def _encode_scaled(im: Image.Image, scale: float) -> BytesIO:
+    size = (max(1, round(im.width * scale)), max(1, round(im.height * scale)))
+    buffer = BytesIO()
+    if getattr(im, "is_animated", False):
+        # frames are resized one at a time as the encoder asks for them
+        frames = (
+            frame.resize(size, resample=Image.Resampling.BICUBIC)
+            for frame in ImageSequence.Iterator(im)
+        )
+        first = next(frames)
+        first.save(
+            buffer,
+            "gif",
+            save_all=True,
+            append_images=frames,
+            loop=im.info.get("loop", 0),
+            background=im.info.get("background", 0),
+        )
+    else:
+        im.resize(size, resample=Image.Resampling.BICUBIC).save(
+            buffer, "gif" if im.format == "GIF" else "png"
+        )
+    buffer.seek(0)
+    return buffer
+
+
+def resize_to_limit(data: IO[bytes], limit: int) -> IO[bytes]:
     """
     Downsize it for huge PIL images.
-    Half the resolution until the byte count is within the limit.
+    The scale comes from how far over the limit the image is, so it's
+    usually encoded once, twice when the first guess was still too big.
     """
-    current_size = data.getbuffer().nbytes
-    while current_size > limit:
-        with Image.open(data) as im:
-            data = BytesIO()
-            if im.format == "PNG":
-                im = im.resize(tuple([i // 2 for i in im.size]), resample=Image.BICUBIC)  # type: ignore
-                im.save(data, "png")
-            elif im.format == "GIF":
-                durations = []
-                new_frames = []
-                for frame in ImageSequence.Iterator(im):
-                    durations.append(frame.info["duration"])
-                    new_frames.append(
-                        frame.resize([i // 2 for i in im.size], resample=Image.BICUBIC)
-                    )
-                new_frames[0].save(
-                    data,
-                    save_all=True,
-                    append_images=new_frames[1:],
-                    format="gif",
-                    version=im.info["version"],
-                    duration=durations,
-                    loop=0,
-                    transparency=0,
-                    background=im.info["background"],
-                    palette=im.getpalette(),
-                )
-            data.seek(0)
-            current_size = data.getbuffer().nbytes
+    current_size = data.seek(0, os.SEEK_END)
+    data.seek(0)
+    if current_size <= limit:
+        return data
+
+    with Image.open(data) as im:
+        scale = 1.0
+        while current_size > limit and max(im.size) * scale > 1:
+            # always shrink by at least 10% so a bad guess can't stall
+            scale *= min(math.sqrt(limit / current_size) * DOWNSCALE_MARGIN, 0.9)
+            encoded = _encode_scaled(im, scale)
+            current_size = encoded.getbuffer().nbytes
+            data = encoded
     return data
 
 
+def grid_cell_size(count: int) -> int:
+    """Width of each square in a `format_bytes` grid of ``count`` images."""
+    return int(2520 / math.ceil(math.sqrt(count)))
+
+
 # https://github.com/CuteFwan/Koishi/blob/master/cogs/avatar.py#L82-L102
-@to_thread
-def format_bytes(filesize_limit: int, images: List[bytes]) -> BytesIO:
+def format_bytes(
+    filesize_limit: int, images: Sequence[Optional[IO[bytes]]]
+) -> IO[bytes]:
     xbound = math.ceil(math.sqrt(len(images)))
     ybound = math.ceil(len(images) / xbound)
-    size = int(2520 / xbound)
+    size = grid_cell_size(len(images))
 
     with Image.new(
         "RGBA", size=(xbound * size, ybound * size), color=(0, 0, 0, 0)
     ) as base:
         x, y = 0, 0
         for avy in images:
-            if avy:
-                im = Image.open(BytesIO(avy)).resize(
-                    (size, size), resample=Image.BICUBIC
-                )
+            if avy is not None:
+                im = Image.open(avy).resize((size, size), resample=Image.BICUBIC)
                 base.paste(im, box=(x * size, y * size))
             if x < xbound - 1:
                 x += 1
@@ -238,13 +253,77 @@ def format_status(member: discord.Member) -> str:
     return f'{"on " if member.status is discord.Status.dnd else ""}{member.raw_status}'
 
 
-@to_thread
-def update_pokemon(bot: Fishie):
-    url = "https://raw.githubusercontent.com/poketwo/data/master/csv/pokemon.csv"
-    data = pd.read_csv(url)
-    pokemon = [str(p).lower() for p in data["name.en"]]
+POKEMON_URL = "https://raw.githubusercontent.com/poketwo/data/master/csv/pokemon.csv"
+POKEMON_SNAPSHOT = "files/pokemon.json"
+
+
+def read_pokemon_snapshot() -> Optional[Dict[str, Any]]:
+    """
+    Reads the last downloaded pokemon list, this is what the bot uses
+    until (and if) the refresh in `update_pokemon` finishes.
+    """
+    try:
+        with open(POKEMON_SNAPSHOT, encoding="utf-8") as fp:
+            return json.load(fp)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def write_pokemon_snapshot(snapshot: Dict[str, Any]):
+    tmp = f"{POKEMON_SNAPSHOT}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fp:
+        json.dump(snapshot, fp, separators=(",", ":"))
+
+    os.replace(tmp, POKEMON_SNAPSHOT)
+
+
+async def update_pokemon(bot: Fishie, snapshot: Optional[Dict[str, Any]] = None):
+    headers = {}
+    if snapshot:
+        if snapshot.get("etag"):
+            headers["If-None-Match"] = snapshot["etag"]
+        if snapshot.get("last_modified"):
+            headers["If-Modified-Since"] = snapshot["last_modified"]
+
+    async with bot.session.get(POKEMON_URL, headers=headers) as resp:
+        if resp.status == 304:
+            bot.logger.info("Pokemon snapshot is up to date")
+            return
+
+        response_checker(resp)
+        data = await resp.read()
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+
+    sha256 = hashlib.sha256(data).hexdigest()
+    if snapshot and snapshot.get("sha256") == sha256:
+        bot.logger.info("Pokemon snapshot is up to date")
+        if (etag, last_modified) != (
+            snapshot.get("etag"),
+            snapshot.get("last_modified"),
+        ):
+            # same list under new validators, keep them so the next check can 304
+            await asyncio.to_thread(
+                write_pokemon_snapshot,
+                {**snapshot, "etag": etag, "last_modified": last_modified},
+            )
+        return
+
+    reader = csv.DictReader(StringIO(data.decode("utf-8")))
+    pokemon = [row["name.en"].lower() for row in reader if row["name.en"]]
 
     bot.pokemon = pokemon
+    bot.logger.info(f"Added {len(pokemon):,} pokemon")
+
+    await asyncio.to_thread(
+        write_pokemon_snapshot,
+        {
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": sha256,
+            "names": pokemon,
+        },
+    )
 
 
 async def get_or_fetch_user(bot: Fishie, user_id: int) -> discord.User:
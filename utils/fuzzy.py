@@ -12,11 +12,17 @@ from __future__ import annotations
 
 import heapq
 import re
+from collections import Counter
 from difflib import SequenceMatcher
+from time import perf_counter
 from typing import (
+    Any,
     Callable,
     Generator,
+    Generic,
+    Hashable,
     Iterable,
+    Iterator,
     Literal,
     Optional,
     Sequence,
@@ -25,6 +31,7 @@ from typing import (
 )
 
 T = TypeVar("T")
+H = TypeVar("H", bound=Hashable)
 
 
 def ratio(a: str, b: str) -> int:
@@ -357,3 +364,255 @@ def find(
         return finder(text, collection, key=key)[0]
     except IndexError:
         return None
+
+
+def _pairs(text: str) -> set[str]:
+    # every pair of characters that appear in order, not necessarily next to each other
+    return {a + b for i, a in enumerate(text) for b in text[i + 1 :]}
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class _Entry(Generic[H]):
+    __slots__ = ("item", "label", "lowered", "counts")
+
+    def __init__(self, item: H, label: str):
+        self.item: H = item
+        self.label: str = label
+        self.lowered: str = label.lower()
+        self.counts: Counter[str] = Counter(label)
+
+
+class FuzzyIndex(Generic[H]):
+    """An index over a collection that gets searched over and over again.
+
+    Gives the same results as calling `finder` and `extract` with the
+    collection, but only has to look at the candidates that can match:
+
+    - `finder` only scores entries containing every consecutive pair of
+      characters of the query in order, which is every entry it could match.
+    - `extract` works out `quick_ratio` from character counts, which is
+      also an upper bound for `ratio` so most entries never get a
+      SequenceMatcher built for them.
+    - `search` additionally falls back to a trigram shortlist so typos
+      still return something, and can be given a time budget.
+
+    Items have to be hashable, entries can be added and removed at any time.
+    """
+
+    def __init__(
+        self, items: Iterable[H] = (), *, key: Optional[Callable[[H], str]] = None
+    ):
+        self.key: Optional[Callable[[H], str]] = key
+        self._entries: dict[int, _Entry[H]] = {}
+        self._ids: dict[H, int] = {}
+        self._chars: dict[str, set[int]] = {}
+        self._pairs: dict[str, set[int]] = {}
+        self._trigrams: dict[str, set[int]] = {}
+        self._next_id: int = 0
+
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[H]:
+        return (entry.item for entry in self._entries.values())
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._ids
+
+    def __repr__(self) -> str:
+        return f"<FuzzyIndex entries={len(self)}>"
+
+    def _postings(self, lowered: str) -> Iterator[tuple[dict[str, set[int]], str]]:
+        for char in set(lowered):
+            yield self._chars, char
+        for pair in _pairs(lowered):
+            yield self._pairs, pair
+        for gram in _trigrams(lowered):
+            yield self._trigrams, gram
+
+    def add(self, item: H) -> None:
+        if item in self._ids:
+            return
+
+        entry = _Entry(item, self.key(item) if self.key else str(item))
+        entry_id = self._ids[item] = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = entry
+
+        for postings, gram in self._postings(entry.lowered):
+            postings.setdefault(gram, set()).add(entry_id)
+
+    def remove(self, item: H) -> None:
+        entry_id = self._ids.pop(item)
+        entry = self._entries.pop(entry_id)
+
+        for postings, gram in self._postings(entry.lowered):
+            ids = postings[gram]
+            ids.discard(entry_id)
+            if not ids:
+                del postings[gram]
+
+    def _candidates(self, lowered: str) -> Iterable[int]:
+        if not lowered:
+            return self._entries.keys()
+
+        if len(lowered) == 1:
+            return self._chars.get(lowered, ())
+
+        postings = [
+            self._pairs.get(lowered[i : i + 2], set()) for i in range(len(lowered) - 1)
+        ]
+        postings.sort(key=len)
+        return set.intersection(*postings)
+
+    def shortlist(self, query: str) -> list[int]:
+        """Entry IDs sharing at least half of the query's trigrams, most shared first."""
+        grams = _trigrams(query.lower())
+        counts: dict[int, int] = {}
+        for gram in grams:
+            for entry_id in self._trigrams.get(gram, ()):
+                counts[entry_id] = counts.get(entry_id, 0) + 1
+
+        needed = max(1, len(grams) // 2)
+        return sorted(
+            (i for i, count in counts.items() if count >= needed),
+            key=lambda i: (-counts[i], i),
+        )
+
+    def _finder(
+        self, text: str, deadline: Optional[float] = None
+    ) -> list[tuple[int, int, str, H]]:
+        regex = re.compile(".*?".join(map(re.escape, text)), flags=re.IGNORECASE)
+
+        suggestions: list[tuple[int, int, str, H]] = []
+        for checked, entry_id in enumerate(self._candidates(text.lower()), start=1):
+            entry = self._entries[entry_id]
+            r = regex.search(entry.label)
+            if r:
+                suggestions.append((len(r.group()), r.start(), entry.label, entry.item))
+
+            if deadline is not None and checked % 64 == 0 and perf_counter() > deadline:
+                break
+
+        suggestions.sort(key=lambda t: t[:3])
+        return suggestions
+
+    @overload
+    def finder(self, text: str, *, raw: Literal[True]) -> list[tuple[int, int, H]]: ...
+
+    @overload
+    def finder(self, text: str, *, raw: Literal[False] = ...) -> list[H]: ...
+
+    def finder(
+        self, text: str, *, raw: bool = False
+    ) -> list[tuple[int, int, H]] | list[H]:
+        """Same as `finder(text, collection, key=key, raw=raw)`."""
+        suggestions = self._finder(str(text))
+        if raw:
+            return [(length, start, item) for length, start, _, item in suggestions]
+        return [item for _, _, _, item in suggestions]
+
+    def extract(
+        self,
+        query: str,
+        *,
+        scorer: Callable[[str, str], int] = quick_ratio,
+        score_cutoff: int = 0,
+        limit: Optional[int] = 10,
+    ) -> list[tuple[str, int]]:
+        """Same as `extract(query, [labels], ...)`."""
+        entries = list(self._entries.values())
+
+        if scorer is not quick_ratio and scorer is not ratio:
+            # no cheap bound for these
+            labels = [entry.label for entry in entries]
+            return extract(
+                query, labels, scorer=scorer, score_cutoff=score_cutoff, limit=limit
+            )
+
+        # this is what SequenceMatcher.quick_ratio does, without building one
+        counts = Counter(query)
+        quick: list[tuple[int, int, str]] = []
+        for order, entry in enumerate(entries):
+            length = len(query) + len(entry.label)
+            matches = sum(min(n, entry.counts[char]) for char, n in counts.items())
+            score = int(round(100 * (2.0 * matches / length if length else 1.0)))
+            if score >= score_cutoff:
+                quick.append((score, order, entry.label))
+
+        if scorer is quick_ratio:
+            results = quick
+        else:
+            # ratio never beats quick_ratio, so go through the best bounds first
+            # and stop once nothing left can make it into the top `limit`
+            quick.sort(key=lambda t: (-t[0], t[1]))
+            results = []
+            top: list[tuple[int, int]] = []
+            for bound, order, label in quick:
+                if limit is not None and len(top) >= limit and bound < top[0][0]:
+                    break
+
+                score = ratio(query, label)
+                if score < score_cutoff:
+                    continue
+
+                results.append((score, order, label))
+                if limit is not None:
+                    if len(top) < limit:
+                        heapq.heappush(top, (score, -order))
+                    elif (score, -order) > top[0]:
+                        heapq.heapreplace(top, (score, -order))
+
+        # ties keep their original order, like heapq.nlargest and sorted do
+        results.sort(key=lambda t: (-t[0], t[1]))
+        if limit is not None:
+            results = results[:limit]
+
+        return [(label, score) for score, _, label in results]
+
+    def search(
+        self, query: str, *, limit: int = 25, budget: Optional[float] = None
+    ) -> list[H]:
+        """`finder`, but falls back to the trigram shortlist when nothing matches.
+
+        If `budget` (in seconds) is given, stops checking candidates once
+        it's up and returns the best of what was found.
+        """
+        deadline = perf_counter() + budget if budget is not None else None
+        suggestions = self._finder(str(query), deadline)
+        if suggestions:
+            return [item for _, _, _, item in suggestions[:limit]]
+
+        return [self._entries[i].item for i in self.shortlist(query)[:limit]]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialises an index of strings, to be restored with `from_dict`."""
+        if self.key is not None:
+            raise TypeError("Only indexes without a key function can be serialised")
+
+        ids = {entry_id: n for n, entry_id in enumerate(self._entries)}
+        return {
+            "labels": [entry.label for entry in self._entries.values()],
+            "chars": {g: [ids[i] for i in v] for g, v in self._chars.items()},
+            "pairs": {g: [ids[i] for i in v] for g, v in self._pairs.items()},
+            "trigrams": {g: [ids[i] for i in v] for g, v in self._trigrams.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> FuzzyIndex[str]:
+        self: FuzzyIndex[str] = cls()  # type: ignore
+        for entry_id, label in enumerate(data["labels"]):
+            self._entries[entry_id] = _Entry(label, label)
+            self._ids[label] = entry_id
+
+        self._next_id = len(self._entries)
+        self._chars = {g: set(v) for g, v in data["chars"].items()}
+        self._pairs = {g: set(v) for g, v in data["pairs"].items()}
+        self._trigrams = {g: set(v) for g, v in data["trigrams"].items()}
+        return self
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+
+__all__ = (
+    "IGNORED_PARAMS",
+    "CachedResponse",
+    "APIStats",
+    "HTTPCache",
+    "parse_retry_after",
+)
+
+# query params that don't change the response, only who pays for it
+IGNORED_PARAMS = frozenset({"key", "api_key", "access_token"})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, which is either a number
+    of seconds or an HTTP date. None when it's missing or malformed."""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(
+        0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+    )
+
+
+class CachedResponse:
+    """The parts of an `aiohttp.ClientResponse` worth keeping around."""
+
+    __slots__ = ("url", "status", "reason", "headers", "body")
+
+    def __init__(
+        self,
+        url: str,
+        status: int,
+        reason: Optional[str],
+        headers: CIMultiDictProxy[str],
+        body: bytes,
+    ):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+    def text(self) -> str:
+        return self.body.decode()
+
+
+class _Entry:
+    __slots__ = ("response", "expires", "etag", "last_modified")
+
+    def __init__(self, response: CachedResponse, expires: float):
+        self.response = response
+        self.expires = expires
+        self.etag: Optional[str] = response.headers.get("ETag")
+        self.last_modified: Optional[str] = response.headers.get("Last-Modified")
+
+
+class APIStats:
+    __slots__ = ("hits", "joined", "misses", "revalidated", "bytes_saved")
+
+    def __init__(self):
+        self.hits = 0
+        # waited on an identical request that was already in flight
+        self.joined = 0
+        self.misses = 0
+        # expired entries the server said were still good, these still
+        # cost a request but not the body
+        self.revalidated = 0
+        self.bytes_saved = 0
+
+    @property
+    def requests_saved(self) -> int:
+        return self.hits + self.joined
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.joined + self.revalidated + self.misses
+        return (self.hits + self.joined + self.revalidated) / total if total else 0.0
+
+
+class HTTPCache:
+    """Caches successful GET responses from third party APIs.
+
+    Responses are keyed by URL and query params (minus API keys) and kept
+    for a TTL given per API, least recently used ones are dropped once the
+    bodies go over ``max_bytes``. Expired responses with an ETag or
+    Last-Modified header are revalidated instead of fetched again, and
+    concurrent misses for the same key share one request.
+    """
+
+    def __init__(
+        self, session: aiohttp.ClientSession, *, max_bytes: int = 32 * 1024 * 1024
+    ):
+        self.session = session
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task[CachedResponse]] = {}
+        self.stats: Dict[str, APIStats] = {}
+
+    def _key(self, url: str, params: Optional[Mapping[str, Any]]) -> str:
+        if not params:
+            return url
+
+        query = sorted(
+            (k, str(v)) for k, v in params.items() if k not in IGNORED_PARAMS
+        )
+        return f"{url}?{'&'.join(f'{k}={v}' for k, v in query)}"
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        self._drop(key)
+        size = len(entry.response.body)
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = entry
+        self.size += size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted.response.body)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry.response.body)
+
+    def is_fresh(self, url: str, params: Optional[Mapping[str, Any]] = None) -> bool:
+        """Whether a GET for this would be answered without a request."""
+        entry = self._entries.get(self._key(url, params))
+        return entry is not None and entry.expires > time.monotonic()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    async def get(
+        self,
+        api: str,
+        url: str,
+        *,
+        ttl: float,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> CachedResponse:
+        """Performs a GET request, answering from the cache when possible.
+
+        ``api`` only groups the stats. Only 200 responses are cached, the
+        rest are returned as is for the caller to check.
+        """
+        stats = self.stats.setdefault(api, APIStats())
+        key = self._key(url, params)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires > now:
+            self._entries.move_to_end(key)
+            stats.hits += 1
+            stats.bytes_saved += len(entry.response.body)
+            return entry.response
+
+        task = self._inflight.get(key)
+        if task is not None:
+            response = await asyncio.shield(task)
+            stats.joined += 1
+            stats.bytes_saved += len(response.body)
+            return response
+
+        task = asyncio.create_task(
+            self._fetch(stats, key, url, ttl, params, headers, entry)
+        )
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key))
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        stats: APIStats,
+        key: str,
+        url: str,
+        ttl: float,
+        params: Optional[Mapping[str, Any]],
+        headers: Optional[Mapping[str, str]],
+        entry: Optional[_Entry],
+    ) -> CachedResponse:
+        request_headers: Dict[str, str] = dict(headers or {})
+        if entry is not None:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+
+        async with self.session.get(
+            url, params=params, headers=request_headers
+        ) as resp:
+            now = time.monotonic()
+            if resp.status == 304 and entry is not None:
+                entry.expires = now + ttl
+                self._entries.move_to_end(key)
+                stats.revalidated += 1
+                stats.bytes_saved += len(entry.response.body)
+                return entry.response
+
+            response = CachedResponse(
+                str(resp.url),
+                resp.status,
+                resp.reason,
+                CIMultiDictProxy(CIMultiDict(resp.headers)),
+                await resp.read(),
+            )
+
+        stats.misses += 1
+        if response.status == 200:
+            self._store(key, _Entry(response, now + ttl))
+
+        return response
+
+    def report(self) -> Tuple[int, int, Dict[str, APIStats]]:
+        """Returns (entries, bytes, stats per API)."""
+        return len(self._entries), self.size, self.stats
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .functions import format_bytes, resize_to_limit
+from .imports import lazy_import
+
+if TYPE_CHECKING:
+    from PIL import Image
+else:
+    Image = lazy_import("PIL.Image")
+
+__all__ = ("SharedReader", "OperationStats", "ImageEngine")
+
+_log = logging.getLogger(__name__)
+
+# (offset, size) of each image in a shared memory block, size 0 for a missing image
+Spans = List[Tuple[int, int]]
+
+
+class SharedReader(io.RawIOBase):
+    """Read only file object over a slice of a shared memory block.
+
+    Pillow reads straight out of the block, nothing is copied up front.
+    Wrapped in a BufferedReader by ``_open_spans`` so Pillow's many small
+    reads don't each go through readinto.
+    """
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        chunk = self._view[self._pos : self._pos + len(buffer)]
+        size = len(chunk)
+        buffer[:size] = chunk
+        chunk.release()
+        self._pos += size
+        return size
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            self._pos = offset
+        elif whence == os.SEEK_CUR:
+            self._pos += offset
+        else:
+            self._pos = len(self._view) + offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def _open_spans(shm: SharedMemory, spans: Spans) -> List[Optional[IO[bytes]]]:
+    buf = shm.buf
+    assert buf is not None
+    return [
+        io.BufferedReader(SharedReader(buf[offset : offset + size])) if size else None
+        for offset, size in spans
+    ]
+
+
+def _run_downscale(
+    name: str, spans: Spans, limit: int
+) -> Tuple[Optional[bytes], float]:
+    # returns None when the image is already within the limit
+    start = time.perf_counter()
+    shm = SharedMemory(name)
+    try:
+        (reader,) = _open_spans(shm, spans)
+        assert reader is not None
+        try:
+            result = resize_to_limit(reader, limit)
+            data = None if result is reader else result.read()
+        finally:
+            reader.close()
+    finally:
+        shm.close()
+    return data, time.perf_counter() - start
+
+
+def _run_grid(name: str, spans: Spans, limit: int) -> Tuple[bytes, float]:
+    start = time.perf_counter()
+    shm = SharedMemory(name)
+    try:
+        readers = _open_spans(shm, spans)
+        try:
+            data = format_bytes(limit, readers).read()
+        finally:
+            for reader in readers:
+                if reader is not None:
+                    reader.close()
+    finally:
+        shm.close()
+    return data, time.perf_counter() - start
+
+
+def _run_thumbnail(name: str, spans: Spans, size: int) -> Tuple[bytes, float]:
+    start = time.perf_counter()
+    shm = SharedMemory(name)
+    try:
+        (reader,) = _open_spans(shm, spans)
+        assert reader is not None
+        try:
+            with Image.open(reader) as im:
+                # jpegs decode straight to roughly the right size, everything
+                # else is reduced by a whole factor before the actual resample
+                im.draft("RGB", (size, size))
+                thumbnail = im.convert("RGBA").resize(
+                    (size, size), resample=Image.Resampling.BICUBIC, reducing_gap=2.0
+                )
+        finally:
+            reader.close()
+    finally:
+        shm.close()
+
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, "png")
+    return buffer.getvalue(), time.perf_counter() - start
+
+
+class OperationStats:
+    __slots__ = (
+        "calls",
+        "failures",
+        "waited",
+        "worked",
+        "elapsed",
+        "slowest",
+        "bytes_in",
+        "bytes_out",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        # seconds, waited is time spent queued behind the pending bytes limit,
+        # worked is time spent inside the worker, elapsed is the whole call
+        self.waited = 0.0
+        self.worked = 0.0
+        self.elapsed = 0.0
+        self.slowest = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    @property
+    def average(self) -> float:
+        return self.elapsed / self.calls if self.calls else 0.0
+
+
+class ImageEngine:
+    """Runs Pillow work in a process pool so it can't hold up the event loop.
+
+    Image buffers are handed to the workers through shared memory instead of
+    being pickled. New jobs wait while more than ``max_pending`` bytes of
+    images are already queued or being worked on, a single job bigger than
+    that runs on its own.
+    """
+
+    def __init__(self, *, workers: int = 2, max_pending: int = 64 * 1024 * 1024):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        # woken whenever pending goes down
+        self._waiters: List[asyncio.Future[None]] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats: Dict[str, OperationStats] = {}
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawned rather than forked, forking a running bot copies its
+            # sockets and the event loop
+            self._pool = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _run(
+        self,
+        op: str,
+        func: Callable[[str, Spans, int], Tuple[Optional[bytes], float]],
+        images: Sequence[Optional[bytes]],
+        arg: int,
+    ) -> Optional[bytes]:
+        stats = self.stats.setdefault(op, OperationStats())
+        size = sum(len(image) for image in images if image)
+        start = time.perf_counter()
+
+        loop = asyncio.get_running_loop()
+        while self.pending and self.pending + size > self.max_pending:
+            waiter = loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.pending += size
+        admitted = time.perf_counter()
+
+        try:
+            shm = SharedMemory(create=True, size=max(size, 1))
+        except BaseException:
+            self._release(None, size)
+            raise
+
+        try:
+            buf = shm.buf
+            assert buf is not None
+            spans: Spans = []
+            offset = 0
+            for image in images:
+                length = len(image) if image else 0
+                if length:
+                    buf[offset : offset + length] = image  # type: ignore
+                spans.append((offset, length))
+                offset += length
+
+            future = self.pool.submit(func, shm.name, spans, arg)
+        except BaseException:
+            stats.failures += 1
+            self._release(shm, size)
+            raise
+
+        # the block has to outlive the worker, not the caller, who may be
+        # cancelled while the job is still queued or running
+        def _done(_: Future[Any]) -> None:
+            try:
+                loop.call_soon_threadsafe(self._release, shm, size)
+            except RuntimeError:
+                # the loop is gone, nobody is waiting on pending anymore
+                self._release(shm, size)
+
+        future.add_done_callback(_done)
+        try:
+            data, worked = await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            stats.failures += 1
+            _log.warning(f"Image worker died during {op}, restarting the pool")
+            self.close()
+            raise
+        except BaseException:
+            stats.failures += 1
+            raise
+
+        elapsed = time.perf_counter() - start
+        stats.calls += 1
+        stats.waited += admitted - start
+        stats.worked += worked
+        stats.elapsed += elapsed
+        stats.slowest = max(stats.slowest, elapsed)
+        stats.bytes_in += size
+        stats.bytes_out += len(data) if data is not None else size
+        return data
+
+    def _release(self, shm: Optional[SharedMemory], size: int) -> None:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+        self.pending -= size
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def downscale(self, data: bytes, limit: int) -> io.BytesIO:
+        """Scales the image (every frame of a GIF) down until it fits in ``limit`` bytes."""
+        # same work either way, but a GIF costs a frame count more than a still
+        # so they're counted apart, mixed together the averages mean nothing
+        op = "downscale (gif)" if data[:4] == b"GIF8" else "downscale"
+        result = await self._run(op, _run_downscale, [data], limit)
+        return io.BytesIO(data if result is None else result)
+
+    async def grid(self, images: Sequence[Optional[bytes]], limit: int) -> io.BytesIO:
+        """Pastes the images into a square grid PNG that fits in ``limit`` bytes."""
+        result = await self._run("grid", _run_grid, images, limit)
+        assert result is not None
+        return io.BytesIO(result)
+
+    async def thumbnail(self, data: bytes, size: int) -> bytes:
+        """Scales the image's first frame to a ``size`` square PNG."""
+        result = await self._run("thumbnail", _run_thumbnail, [data], size)
+        assert result is not None
+        return result
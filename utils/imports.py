@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import importlib
+import subprocess
+import sys
+import threading
+from types import ModuleType
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a module that only gets imported on first attribute access.
+
+    Heavy dependencies (pandas, PIL, yt_dlp, ...) are only needed by a handful
+    of commands, so there's no reason to pay for them before the bot connects.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__lock = threading.Lock()
+        self.__module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self.__module is None:
+            # to_thread workers can race each other to the first access
+            with self.__lock:
+                if self.__module is None:
+                    self.__module = importlib.import_module(self.__name__)
+
+        return self.__module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        return f"<LazyModule {self.__name__!r} loaded={self.loaded}>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Returns the module if it has already been imported, otherwise a `LazyModule`."""
+    try:
+        return sys.modules[name]
+    except KeyError:
+        return LazyModule(name)
+
+
+def import_report(
+    modules: Iterable[str], *, limit: int = 25
+) -> List[Tuple[int, int, str]]:
+    """Imports the modules in a fresh interpreter with `-X importtime`.
+
+    Returns the slowest imports as (self us, cumulative us, module) tuples,
+    sorted by cumulative time.
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.splitlines()[-1])
+
+    rows: List[Tuple[int, int, str]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        self_us, cumulative, name = line.removeprefix("import time:").split("|")
+        try:
+            rows.append((int(self_us), int(cumulative), name.rstrip()))
+        except ValueError:
+            # header line
+            continue
+
+    rows.sort(key=lambda r: r[1], reverse=True)
+    return rows[:limit]
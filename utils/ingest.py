@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Tuple
+
+__all__ = ("IngestQueue",)
+
+_log = logging.getLogger(__name__)
+
+Job = Tuple[float, Callable[..., Awaitable[Any]], Tuple[Any, ...]]
+
+
+class IngestQueue:
+    """Runs work handed off by event listeners on a fixed number of workers.
+
+    Listeners only enqueue, so a burst of events (everyone changing their
+    avatar for a promo) can't stall dispatch or open hundreds of uploads at
+    once. Jobs past ``maxsize`` are dropped rather than queued without bound.
+    """
+
+    def __init__(self, name: str, *, workers: int = 4, maxsize: int = 10_000):
+        self.name = name
+        self.workers = workers
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize)
+        self._tasks: List[asyncio.Task[None]] = []
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.deepest = 0
+        # seconds between a job being submitted and a worker starting it
+        self.lag: Deque[float] = deque(maxlen=1000)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"ingest:{self.name}:{i}")
+            for i in range(self.workers)
+        ]
+
+    def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def submit(self, func: Callable[..., Awaitable[Any]], *args: Any) -> bool:
+        try:
+            self._queue.put_nowait((time.monotonic(), func, args))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+        self.deepest = max(self.deepest, self._queue.qsize())
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            submitted, func, args = await self._queue.get()
+            self.lag.append(time.monotonic() - submitted)
+            try:
+                await func(*args)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                _log.warning(
+                    f"{self.name} job {getattr(func, '__qualname__', func)} failed: {e.__class__.__name__}: {e}"
+                )
+            else:
+                self.processed += 1
+            finally:
+                self._queue.task_done()
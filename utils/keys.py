@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import datetime
+import hashlib
+import random
+from typing import TYPE_CHECKING, Any, List, Literal, Optional, Sequence, Tuple
+
+import dateutil.tz
+import discord
+from discord.ext import commands
+
+if TYPE_CHECKING:
+    from core import Fishie
+
+# google's daily quotas reset at midnight pacific time
+QUOTA_TIMEZONE = dateutil.tz.gettz("America/Los_Angeles")
+
+# the key is done until the quota resets
+DAILY_QUOTA_REASONS = frozenset({"dailyLimitExceeded", "quotaExceeded"})
+# per-minute limits, the key is usable again shortly
+RATE_LIMIT_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+
+# seconds a rate limited key is skipped when google doesn't say how long
+RATE_LIMIT_BACKOFF = 60
+
+QuotaError = Literal["daily", "rate"]
+
+
+def _exhausted_reason(flag: Any) -> Optional[QuotaError]:
+    if flag is None:
+        return None
+    # anything else, including the "1" older versions stored, is a daily lockout
+    return "rate" if flag in ("rate", b"rate") else "daily"
+
+
+def quota_reset() -> datetime.datetime:
+    now = datetime.datetime.now(QUOTA_TIMEZONE)
+    tomorrow = now.date() + datetime.timedelta(days=1)
+    return datetime.datetime.combine(tomorrow, datetime.time(), tzinfo=QUOTA_TIMEZONE)
+
+
+def quota_error(status: int, body: Any) -> Optional[QuotaError]:
+    """Whether a Google API error response means the key is out of quota.
+
+    "daily" when the day's quota is spent, "rate" when it only hit a
+    per-minute limit, None for anything else.
+    """
+    if status not in (403, 429):
+        return None
+
+    reasons = set()
+    if isinstance(body, dict):
+        reasons = {e.get("reason") for e in body.get("error", {}).get("errors", [])}
+
+    if reasons & DAILY_QUOTA_REASONS:
+        return "daily"
+    if status == 429 or reasons & RATE_LIMIT_REASONS:
+        return "rate"
+    return None
+
+
+class GoogleKeyScheduler:
+    """Hands out the Google API key with the least usage today.
+
+    Keys that ran out of quota are skipped until the quota resets, rate
+    limited ones for a minute or so. Usage and exhausted keys are kept in
+    Redis so every process and restart agrees, keys are stored by a short
+    hash rather than the key itself.
+    """
+
+    def __init__(self, bot: Fishie, keys: Sequence[str]):
+        self.bot = bot
+        self.keys = list(keys)
+        self._ids = {key: hashlib.sha1(key.encode()).hexdigest()[:8] for key in keys}
+
+    def _usage_key(self, api: str) -> str:
+        day = datetime.datetime.now(QUOTA_TIMEZONE).date()
+        return f"google_keys:{api}:{day}"
+
+    def _exhausted_key(self, api: str, key: str) -> str:
+        return f"google_keys:{api}:exhausted:{self._ids[key]}"
+
+    async def usage(self, api: str) -> List[Tuple[str, int, Optional[QuotaError]]]:
+        """Returns (key id, requests today, why it's unavailable) for every key."""
+        if not self.keys:
+            return []
+
+        redis = self.bot.redis
+        counts = await redis.hgetall(self._usage_key(api))
+        exhausted = await redis.mget([self._exhausted_key(api, k) for k in self.keys])
+        return [
+            (
+                self._ids[key],
+                int(counts.get(self._ids[key], 0)),
+                _exhausted_reason(flag),
+            )
+            for key, flag in zip(self.keys, exhausted)
+        ]
+
+    async def acquire(self, api: str, *, exclude: Sequence[str] = ()) -> str:
+        healthy: List[Tuple[int, str]] = []
+        rate_limited = False
+        for key, (_, count, exhausted) in zip(self.keys, await self.usage(api)):
+            rate_limited = rate_limited or exhausted == "rate"
+            if exhausted is None and key not in exclude:
+                healthy.append((count, key))
+
+        if not healthy:
+            if rate_limited:
+                raise commands.BadArgument(
+                    "Too many searches right now, try again in a minute."
+                )
+
+            reset = quota_reset()
+            raise commands.BadArgument(
+                f"I've run out of searches for today, try again {discord.utils.format_dt(reset, 'R')}."
+            )
+
+        lowest = min(count for count, _ in healthy)
+        key = random.choice([k for count, k in healthy if count == lowest])
+
+        usage_key = self._usage_key(api)
+        async with self.bot.redis.pipeline(transaction=False) as pipe:
+            pipe.hincrby(usage_key, self._ids[key], 1)
+            pipe.expire(usage_key, 2 * 86400)
+            await pipe.execute()
+
+        return key
+
+    async def exhausted(
+        self,
+        api: str,
+        key: str,
+        reason: QuotaError,
+        *,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """Skips the key until the quota resets, or for a short while if only rate limited."""
+        if reason == "daily":
+            await self.bot.redis.set(
+                self._exhausted_key(api, key), reason, exat=quota_reset()
+            )
+        else:
+            backoff = max(1, round(retry_after or RATE_LIMIT_BACKOFF))
+            # don't shorten a daily lockout that's already there
+            await self.bot.redis.set(
+                self._exhausted_key(api, key), reason, ex=backoff, nx=True
+            )
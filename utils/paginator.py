@@ -26,6 +26,8 @@ from .vars import GoogleImageData
 if TYPE_CHECKING:
     from extensions.context import Context
 
+    from .blobs import BlobStore
+
 blurple = discord.ButtonStyle.blurple
 red = discord.ButtonStyle.red
 
@@ -93,6 +95,10 @@ class Pager(discord.ui.View):
         await self.source._prepare_once()
         page = await self.source.get_page(0)
         kwargs = await self._get_kwargs_from_page(page)
+        # edits replace attachments, sending takes files
+        attachments = kwargs.pop("attachments", None)
+        if attachments:
+            kwargs["files"] = attachments
         self._update_labels(0)
         self.message = await self.ctx.send(**kwargs, view=self)
 
@@ -248,24 +254,44 @@ class UrbanPageSource(menus.ListPageSource):
 
 
 class AvatarsPageSource(menus.ListPageSource):
-    """A page source that requires (avatar, created_at) tuple items."""
+    """A page source that requires (url, created_at, id, blob digest) tuple items.
+
+    Images in the blob store are sent as attachments, the URL is only used
+    for rows that were never copied into it.
+    """
 
     def __init__(
-        self, entries: List[Tuple[str, datetime.datetime, int]], *, per_page=1
+        self,
+        entries: List[Tuple[Optional[str], datetime.datetime, int, Optional[str]]],
+        *,
+        per_page=1,
+        blobs: Optional[BlobStore] = None,
     ):
         super().__init__(entries, per_page=per_page)
         self.embed = discord.Embed(colour=0x2F3136)
+        self.blobs = blobs
 
-    async def format_page(self, menu, entries: Tuple[str, datetime.datetime, int]):
+    async def format_page(
+        self,
+        menu,
+        entries: Tuple[Optional[str], datetime.datetime, int, Optional[str]],
+    ):
         maximum = self.get_max_pages()
+        url, created_at, entry_id, digest = entries
 
         self.embed.set_footer(
-            text=f"Page {menu.current_page + 1}/{maximum} (ID: {entries[2]}) \nChanged"
+            text=f"Page {menu.current_page + 1}/{maximum} (ID: {entry_id}) \nChanged"
         )
-        self.embed.timestamp = entries[1]
-        self.embed.set_image(url=entries[0])
+        self.embed.timestamp = created_at
 
-        return self.embed
+        if digest is not None and self.blobs is not None:
+            file = await self.blobs.file(digest, str(entry_id))
+            if file is not None:
+                self.embed.set_image(url=f"attachment://{file.filename}")
+                return {"embed": self.embed, "content": None, "attachments": [file]}
+
+        self.embed.set_image(url=url)
+        return {"embed": self.embed, "content": None, "attachments": []}
 
 
 class GoogleImagePageSource(menus.ListPageSource):
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import dateutil.tz
+from lru import LRU
+
+if TYPE_CHECKING:
+    from core import Fishie
+
+_log = logging.getLogger(__name__)
+
+# stored for users without a timezone, so they don't fall through to postgres
+_NO_TIMEZONE = ""
+
+# only caches the value read from postgres if nothing invalidated it since
+# the read started, KEYS = (value, version), ARGV = (version, value, ttl)
+_SET_IF_CURRENT = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[1] then
+    return redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+end
+return false
+"""
+
+
+class UserSettings:
+    """Per-user settings with an in-memory LRU and Redis in front of Postgres.
+
+    Redis is shared between every process (and survives restarts), changes are
+    published so each process can drop its own copy. Every change also bumps
+    a version, so a read that raced with it doesn't put the old value back.
+    """
+
+    CHANNEL = "user_settings:invalidate"
+
+    def __init__(self, bot: Fishie, *, maxsize: int = 10_000, ttl: int = 86400):
+        self.bot = bot
+        self.ttl = ttl
+        # user_id -> timezone, _NO_TIMEZONE when they haven't set one
+        self._timezones: LRU = LRU(maxsize)
+        self._tzinfos: Dict[str, datetime.tzinfo] = {}
+        self._listener: Optional[asyncio.Task[None]] = None
+        # bumped on every invalidation this process sees
+        self._generation = 0
+        self.stats: Dict[str, int] = {"memory": 0, "redis": 0, "postgres": 0}
+
+    def _key(self, user_id: int) -> str:
+        return f"user_settings:{user_id}:timezone"
+
+    def _version_key(self, user_id: int) -> str:
+        return f"user_settings:{user_id}:timezone:version"
+
+    def _invalidate(self, user_id: int) -> None:
+        self._timezones.pop(user_id, None)
+        self._generation += 1
+
+    async def start(self) -> None:
+        pubsub = self.bot.redis.pubsub()
+        await pubsub.subscribe(self.CHANNEL)
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+
+    async def _listen(self, pubsub: Any) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+
+                self._invalidate(int(message["data"]))
+        except asyncio.CancelledError:
+            await pubsub.close()
+            raise
+        except Exception as e:
+            # keep serving from memory, it'll just miss updates from other processes
+            _log.warning(f"User settings listener died: {e.__class__.__name__}: {e}")
+
+    async def get_timezone(self, user_id: int, /) -> Optional[str]:
+        try:
+            timezone: str = self._timezones[user_id]
+            self.stats["memory"] += 1
+        except KeyError:
+            generation = self._generation
+            cached, version = await self.bot.redis.mget(
+                self._key(user_id), self._version_key(user_id)
+            )
+            if cached is not None:
+                self.stats["redis"] += 1
+                timezone = cached.decode() if isinstance(cached, bytes) else cached
+            else:
+                self.stats["postgres"] += 1
+                query = "SELECT timezone from user_settings WHERE user_id = $1;"
+                record = await self.bot.pool.fetchrow(query, user_id)
+                timezone = (record and record["timezone"]) or _NO_TIMEZONE
+                await self.bot.redis.eval(
+                    _SET_IF_CURRENT,
+                    2,
+                    self._key(user_id),
+                    self._version_key(user_id),
+                    version or "0",
+                    timezone,
+                    self.ttl,
+                )
+
+            # set_timezone ran while this was reading, what was read may be stale
+            if generation == self._generation:
+                self._timezones[user_id] = timezone
+
+        return timezone or None
+
+    async def get_tzinfo(self, user_id: int, /) -> datetime.tzinfo:
+        timezone = await self.get_timezone(user_id)
+        if timezone is None:
+            return datetime.timezone.utc
+
+        try:
+            return self._tzinfos[timezone]
+        except KeyError:
+            tzinfo = dateutil.tz.gettz(timezone) or datetime.timezone.utc
+            self._tzinfos[timezone] = tzinfo
+            return tzinfo
+
+    async def set_timezone(self, user_id: int, timezone: Optional[str], /) -> None:
+        if timezone is None:
+            query = "UPDATE user_settings SET timezone = NULL WHERE user_id=$1"
+            await self.bot.pool.execute(query, user_id)
+        else:
+            query = """INSERT INTO user_settings (user_id, timezone)
+                       VALUES ($1, $2)
+                       ON CONFLICT (user_id) DO UPDATE SET timezone = $2;
+                    """
+            await self.bot.pool.execute(query, user_id, timezone)
+
+        self._invalidate(user_id)
+        async with self.bot.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(self._version_key(user_id))
+            pipe.expire(self._version_key(user_id), self.ttl * 2)
+            pipe.delete(self._key(user_id))
+            pipe.publish(self.CHANNEL, user_id)
+            await pipe.execute()
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional
+
+from discord.ext import commands
+
+from .http import CachedResponse, parse_retry_after
+
+if TYPE_CHECKING:
+    from core import Fishie
+
+__all__ = ("EndpointStats", "SpotifyClient")
+
+_log = logging.getLogger(__name__)
+
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+API_URL = "https://api.spotify.com/v1"
+
+
+class EndpointStats:
+    __slots__ = ("requests", "latency", "slowest", "retries")
+
+    def __init__(self):
+        self.requests = 0
+        # seconds, cache hits included
+        self.latency = 0.0
+        self.slowest = 0.0
+        self.retries = 0
+
+    @property
+    def average_latency(self) -> float:
+        return self.latency / self.requests if self.requests else 0.0
+
+
+class SpotifyClient:
+    """Spotify Web API client using the client credentials flow.
+
+    The token is refreshed shortly before it expires. A 401 refreshes it
+    once for everyone waiting on it and the request is replayed. A 429 is
+    retried after the Retry-After it came with, if that's short enough.
+    """
+
+    # refresh this many seconds before the token actually expires
+    REFRESH_MARGIN = 60.0
+    # how long to wait before trying again after a failed refresh
+    REFRESH_RETRY = 30.0
+    # don't keep a command waiting longer than this on a 429
+    MAX_RETRY_AFTER = 10.0
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, bot: Fishie):
+        self.bot = bot
+        self.token: Optional[str] = None
+        self.expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task[None]] = None
+        self.stats: Dict[str, EndpointStats] = {}
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._keep_fresh())
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    @property
+    def valid(self) -> bool:
+        return (
+            self.token is not None
+            and time.monotonic() < self.expires_at - self.REFRESH_MARGIN
+        )
+
+    async def _keep_fresh(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                _log.warning(f"Failed to refresh spotify token: {e}")
+                await asyncio.sleep(self.REFRESH_RETRY)
+                continue
+
+            delay = self.expires_at - self.REFRESH_MARGIN - time.monotonic()
+            await asyncio.sleep(max(delay, self.REFRESH_RETRY))
+
+    async def refresh(self, stale: Optional[str] = None) -> str:
+        """Gets a new token, unless someone else already replaced ``stale``."""
+        async with self._lock:
+            if self.token is not None and self.token != stale and self.valid:
+                return self.token
+
+            sid = self.bot.config["keys"]["spotify_id"]
+            ss = self.bot.config["keys"]["spotify_secret"]
+            encoded_key = base64.b64encode(f"{sid}:{ss}".encode("ascii")).decode(
+                "ascii"
+            )
+
+            headers = {
+                "Authorization": f"Basic {encoded_key}",
+                "Content-Type": "application/x-www-form-urlencoded",
+            }
+            data = {"grant_type": "client_credentials"}
+
+            async with self.bot.session.post(
+                TOKEN_URL, headers=headers, data=data
+            ) as r:
+                results: Dict[Any, Any] = await r.json()
+
+            if not results.get("access_token"):
+                raise commands.BadArgument("Unable to set spotify key.")
+
+            self.token = results["access_token"]
+            self.expires_at = time.monotonic() + results.get("expires_in", 3600)
+            return self.token  # type: ignore
+
+    async def get_token(self) -> str:
+        if self.valid:
+            return self.token  # type: ignore
+        return await self.refresh()
+
+    async def get(
+        self, endpoint: str, *, params: Mapping[str, Any], ttl: float = 3600
+    ) -> CachedResponse:
+        """GETs an API endpoint, e.g. ``search``, through the bot's HTTP cache."""
+        stats = self.stats.setdefault(endpoint, EndpointStats())
+        url = f"{API_URL}/{endpoint}"
+
+        for attempt in range(self.MAX_ATTEMPTS):
+            token = await self.get_token()
+            headers = {
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {token}",
+            }
+
+            start = time.perf_counter()
+            resp = await self.bot.http_cache.get(
+                "spotify", url, headers=headers, params=params, ttl=ttl
+            )
+            elapsed = time.perf_counter() - start
+            stats.requests += 1
+            stats.latency += elapsed
+            stats.slowest = max(stats.slowest, elapsed)
+
+            if attempt == self.MAX_ATTEMPTS - 1:
+                break
+
+            if resp.status == 401:
+                stats.retries += 1
+                await self.refresh(stale=token)
+                continue
+
+            if resp.status == 429:
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if retry_after is None:
+                    retry_after = 1.0
+                if retry_after > self.MAX_RETRY_AFTER:
+                    raise commands.BadArgument(
+                        f"Spotify is rate limiting me, try again in {retry_after:.0f} seconds."
+                    )
+
+                stats.retries += 1
+                await asyncio.sleep(retry_after)
+                continue
+
+            break
+
+        return resp
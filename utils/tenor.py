@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+import html
+import re
+from typing import TYPE_CHECKING, Dict, Optional
+
+from cachetools import TTLCache
+from discord.ext import commands
+
+from .vars import base_header
+
+if TYPE_CHECKING:
+    from core import Fishie
+
+CONTAINER_MARKER = 'id="single-gif-container"'
+IMG_SRC_RE = re.compile(r'<img\b[^>]*?\ssrc="([^"]+)"')
+
+
+def find_tenor_media(page: str) -> Optional[str]:
+    """Finds the gif's URL in a tenor page, the first image inside #single-gif-container."""
+    container = page.find(CONTAINER_MARKER)
+    if container == -1:
+        return None
+
+    match = IMG_SRC_RE.search(page, container)
+    if match is None:
+        return None
+
+    return _media_url(match)
+
+
+def _media_url(match: re.Match[str]) -> str:
+    # AAAAd is the preview, AAAAC the actual gif
+    return html.unescape(match.group(1)).replace("AAAAd", "AAAAC")
+
+
+class TenorResolver:
+    """Resolves tenor page URLs to their gif, remembering the answer for a day.
+
+    Pages are streamed and the download stops as soon as the gif's URL shows
+    up, which is well before the end of the page.
+    """
+
+    CHUNK_SIZE = 16 * 1024
+
+    def __init__(self, bot: Fishie, *, maxsize: int = 2048, ttl: float = 86400):
+        self.bot = bot
+        self._resolved = TTLCache[str, str](maxsize=maxsize, ttl=ttl)
+        self._inflight: Dict[str, asyncio.Task[str]] = {}
+
+    async def resolve(self, url: str) -> str:
+        try:
+            return self._resolved[url]
+        except KeyError:
+            pass
+
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._fetch(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url))
+
+        media = await asyncio.shield(task)
+        self._resolved[url] = media
+        return media
+
+    async def _fetch(self, url: str) -> str:
+        # only the part of the page that could still hold a match is kept,
+        # so each chunk is searched once instead of the whole page again
+        tail = ""
+        in_container = False
+        async with self.bot.session.get(url, headers=base_header) as r:
+            if r.status != 200:
+                raise commands.BadArgument("Couldn't find anything.")
+
+            decoder = codecs.getincrementaldecoder(r.charset or "utf-8")("replace")
+            async for chunk in r.content.iter_chunked(self.CHUNK_SIZE):
+                text = tail + decoder.decode(chunk)
+
+                if not in_container:
+                    container = text.find(CONTAINER_MARKER)
+                    if container == -1:
+                        # the marker might be split between this chunk and the next
+                        tail = text[-(len(CONTAINER_MARKER) - 1) :]
+                        continue
+
+                    in_container = True
+                    text = text[container:]
+
+                match = IMG_SRC_RE.search(text)
+                if match is not None:
+                    return _media_url(match)
+
+                # keep the last tag, it might not be complete yet
+                tag = text.rfind("<")
+                tail = text[tag:] if tag != -1 else ""
+
+        raise commands.BadArgument("Couldn't find anything.")
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from core import Fishie
+
+_log = logging.getLogger(__name__)
+
+THUMBNAIL_CACHE = "files/thumbnails"
+
+
+class ThumbnailCache:
+    """Square thumbnails of logged images, kept on disk per size.
+
+    Thumbnails are keyed by something that changes whenever the image does
+    (e.g. ``{user_id}_{avatar_key}``), so a file on disk never goes stale and
+    showing the same history again doesn't download anything. Originals are
+    read from the blob store, only rows that aren't in it yet are downloaded,
+    at most ``concurrency`` at once.
+    """
+
+    def __init__(self, bot: Fishie, *, concurrency: int = 8):
+        self.bot = bot
+        self._downloads = asyncio.Semaphore(concurrency)
+        self._inflight: Dict[str, asyncio.Task[Optional[bytes]]] = {}
+        self.stats = {"disk": 0, "blobs": 0, "created": 0, "failed": 0}
+
+    def _path(self, key: str, size: int) -> str:
+        return os.path.join(THUMBNAIL_CACHE, str(size), f"{key}.png")
+
+    @staticmethod
+    def _read_many(paths: Sequence[str]) -> List[Optional[bytes]]:
+        found: List[Optional[bytes]] = []
+        for path in paths:
+            try:
+                with open(path, "rb") as fp:
+                    found.append(fp.read())
+            except FileNotFoundError:
+                found.append(None)
+        return found
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fp:
+            fp.write(data)
+        os.replace(tmp, path)
+
+    async def get_many(
+        self, images: Sequence[Tuple[str, Optional[str], Optional[str]]], size: int
+    ) -> List[Optional[bytes]]:
+        """Thumbnails for (key, blob digest, url) items, None for images that couldn't be found."""
+        paths = [self._path(key, size) for key, _, _ in images]
+        found = await asyncio.to_thread(self._read_many, paths)
+
+        missing: List[asyncio.Future[Optional[bytes]]] = []
+        indexes: List[int] = []
+        for index, ((_, digest, url), path, data) in enumerate(
+            zip(images, paths, found)
+        ):
+            if data is not None:
+                self.stats["disk"] += 1
+                continue
+
+            task = self._inflight.get(path)
+            if task is None:
+                task = asyncio.create_task(self._create(digest, url, size, path))
+                self._inflight[path] = task
+                task.add_done_callback(lambda _, path=path: self._inflight.pop(path))
+
+            missing.append(asyncio.shield(task))
+            indexes.append(index)
+
+        for index, data in zip(indexes, await asyncio.gather(*missing)):
+            found[index] = data
+        return found
+
+    async def _download(self, url: str) -> Optional[bytes]:
+        try:
+            async with self._downloads:
+                async with self.bot.session.get(url) as resp:
+                    if resp.status != 200:
+                        return None
+                    return await resp.read()
+        except aiohttp.ClientError as e:
+            _log.warning(f"Couldn't download {url} for a thumbnail: {e}")
+            return None
+
+    async def _create(
+        self, digest: Optional[str], url: Optional[str], size: int, path: str
+    ) -> Optional[bytes]:
+        original = None
+        if digest is not None:
+            original = await self.bot.blobs.get(digest)
+            if original is not None:
+                self.stats["blobs"] += 1
+        if original is None and url is not None:
+            original = await self._download(url)
+        if original is None:
+            self.stats["failed"] += 1
+            return None
+
+        try:
+            data = await self.bot.images.thumbnail(original, size)
+        except Exception as e:
+            _log.warning(f"Couldn't make a thumbnail of {digest or url}: {e}")
+            self.stats["failed"] += 1
+            return None
+
+        await asyncio.to_thread(self._write, path, data)
+        self.stats["created"] += 1
+        return data
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from io import BytesIO
+from typing import TYPE_CHECKING, Dict, List
+
+from cachetools import TTLCache
+from discord.ext import commands
+
+if TYPE_CHECKING:
+    from core import Fishie
+
+SVG_URL = (
+    "https://raw.githubusercontent.com/twitter/twemoji/master/assets/svg/{chars}.svg"
+)
+TWEMOJI_CACHE = "files/twemoji"
+VS_16 = "\N{VARIATION SELECTOR-16}"
+
+
+def twemoji_candidates(emoji: str) -> List[str]:
+    """Codepoint sequences twemoji might have the emoji under.
+
+    Most files leave out VS16 but some ZWJ sequences keep it.
+    """
+    candidates = ["-".join(f"{ord(c):x}" for c in emoji)]
+    stripped = emoji.replace(VS_16, "")
+    if stripped and stripped != emoji:
+        candidates.append("-".join(f"{ord(c):x}" for c in stripped))
+    return candidates
+
+
+async def render_with_rsvg(blob: bytes, width: int = 1024):
+    proc = await asyncio.create_subprocess_exec(
+        "rsvg-convert",
+        f"--width={width}",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate(blob)
+    return BytesIO(stdout), stderr
+
+
+class TwemojiRenderer:
+    """Renders twemoji to PNG once and keeps the result on disk.
+
+    Files are named by codepoint sequence and width so a lookup is a file
+    read. Concurrent lookups of the same emoji share one render, and only
+    ``workers`` rsvg-convert processes run at a time.
+    """
+
+    def __init__(
+        self,
+        bot: Fishie,
+        *,
+        workers: int = 2,
+        missing_maxsize: int = 4096,
+        missing_ttl: float = 86400,
+    ):
+        self.bot = bot
+        self._workers = asyncio.Semaphore(workers)
+        self._inflight: Dict[str, asyncio.Task[bytes]] = {}
+        # sequences twemoji doesn't have a file for, these come from user
+        # input so they're bounded and forgotten after a while
+        self._missing = TTLCache[str, bool](maxsize=missing_maxsize, ttl=missing_ttl)
+
+    def _path(self, chars: str, width: int) -> str:
+        return os.path.join(TWEMOJI_CACHE, f"{chars}-{width}.png")
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, "rb") as fp:
+            return fp.read()
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fp:
+            fp.write(data)
+        os.replace(tmp, path)
+
+    async def render(self, emoji: str, *, width: int = 1024) -> BytesIO:
+        for chars in twemoji_candidates(emoji):
+            if chars in self._missing:
+                continue
+
+            path = self._path(chars, width)
+            try:
+                return BytesIO(await asyncio.to_thread(self._read, path))
+            except FileNotFoundError:
+                pass
+
+            task = self._inflight.get(path)
+            if task is None:
+                task = asyncio.create_task(self._render(chars, width, path))
+                self._inflight[path] = task
+                task.add_done_callback(lambda _, path=path: self._inflight.pop(path))
+
+            try:
+                return BytesIO(await asyncio.shield(task))
+            except LookupError:
+                # not under this sequence, try the next one
+                continue
+
+        raise commands.BadArgument("Not a valid unicode emoji.")
+
+    async def _render(self, chars: str, width: int, path: str) -> bytes:
+        async with self.bot.session.get(SVG_URL.format(chars=chars)) as resp:
+            if resp.status == 404:
+                self._missing[chars] = True
+                raise LookupError(chars)
+            if resp.status != 200:
+                raise commands.BadArgument(
+                    f"Couldn't get that emoji right now ({resp.status})."
+                )
+            blob = await resp.read()
+
+        async with self._workers:
+            converted, stderr = await render_with_rsvg(blob, width)
+
+        if stderr:
+            raise Exception(stderr.decode())
+
+        data = converted.getvalue()
+        await asyncio.to_thread(self._write, path, data)
+        return data
@@ -1,4 +1,13 @@
-from typing import List, Optional, ParamSpec, TypeAlias, TypedDict, TypeVar, Union
+from typing import (
+    List,
+    NotRequired,
+    Optional,
+    ParamSpec,
+    TypeAlias,
+    TypedDict,
+    TypeVar,
+    Union,
+)
 
 import discord
 
@@ -67,6 +76,15 @@ class ConfigTokens(TypedDict):
     testing_bot: str
 
 
+class CacheSizes(TypedDict, total=False):
+    user_settings: int
+
+
+class Blobs(TypedDict, total=False):
+    path: str
+    mirror_to_webhooks: bool
+
+
 class Config(TypedDict):
     tokens: ConfigTokens
     keys: Keys
@@ -74,3 +92,5 @@ class Config(TypedDict):
     twitter: Twitter
     ids: Ids
     webhooks: Webhooks
+    cache: NotRequired[CacheSizes]
+    blobs: NotRequired[Blobs]
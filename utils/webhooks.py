@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import List, Optional, Sequence
+
+import aiohttp
+
+__all__ = ("WebhookBucket", "WebhookPool")
+
+_log = logging.getLogger(__name__)
+
+
+class WebhookBucket:
+    __slots__ = ("url", "remaining", "reset_at", "in_flight", "uploads", "rate_limited")
+
+    def __init__(self, url: str):
+        self.url = url
+        # what discord said was left in the current window, None before the
+        # first response or once the window has passed
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.in_flight = 0
+        self.uploads = 0
+        self.rate_limited = 0
+
+    def budget(self, now: float) -> float:
+        if self.remaining is None or now >= self.reset_at:
+            # unknown, assume a fresh window but prefer idle webhooks
+            return WebhookPool.DEFAULT_BUDGET - self.in_flight
+        return self.remaining - self.in_flight
+
+
+class WebhookPool:
+    """Uploads files through a pool of webhooks, spreading them by rate limit budget.
+
+    Every upload goes to the webhook with the most requests left in its
+    current rate limit window, going by the X-RateLimit headers of its last
+    response. When all of them are spent the upload waits for the first
+    window to reset instead of running into a 429.
+    """
+
+    # discord allows webhooks about 5 requests per couple of seconds
+    DEFAULT_BUDGET = 5
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, session: aiohttp.ClientSession, urls: Sequence[str]):
+        self.session = session
+        self.buckets: List[WebhookBucket] = [WebhookBucket(url) for url in urls]
+
+    async def _acquire(self) -> WebhookBucket:
+        while True:
+            now = time.monotonic()
+            best = max(bucket.budget(now) for bucket in self.buckets)
+            if best > 0:
+                bucket = random.choice(
+                    [b for b in self.buckets if b.budget(now) == best]
+                )
+                bucket.in_flight += 1
+                return bucket
+
+            wait = min(b.reset_at for b in self.buckets) - now
+            await asyncio.sleep(max(wait, 0.05))
+
+    def _update(self, bucket: WebhookBucket, resp: aiohttp.ClientResponse) -> None:
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        reset_after = resp.headers.get("X-RateLimit-Reset-After")
+        if remaining is not None and reset_after is not None:
+            bucket.remaining = int(remaining)
+            bucket.reset_at = time.monotonic() + float(reset_after)
+
+    async def upload(self, content: str, data: bytes, filename: str) -> Optional[str]:
+        """Sends ``data`` as an attachment, returns its URL or None if it failed."""
+        if not self.buckets:
+            return None
+
+        payload = json.dumps({"content": content, "allowed_mentions": {"parse": []}})
+        for _ in range(self.MAX_ATTEMPTS):
+            form = aiohttp.FormData()
+            form.add_field("payload_json", payload, content_type="application/json")
+            form.add_field("files[0]", data, filename=filename)
+
+            bucket = await self._acquire()
+            try:
+                async with self.session.post(
+                    bucket.url, params={"wait": "true"}, data=form
+                ) as resp:
+                    self._update(bucket, resp)
+                    if resp.status == 429:
+                        body = await resp.json()
+                        retry_after = float(body.get("retry_after", 1))
+                        bucket.rate_limited += 1
+                        limited = self.buckets if body.get("global") else [bucket]
+                        for b in limited:
+                            b.remaining = 0
+                            b.reset_at = time.monotonic() + retry_after
+                        continue
+
+                    if resp.status >= 400:
+                        _log.warning(
+                            f"Webhook upload of {filename} failed: {resp.status} {await resp.text()}"
+                        )
+                        return None
+
+                    message = await resp.json()
+            except aiohttp.ClientError as e:
+                _log.warning(f"Webhook upload of {filename} failed: {e}")
+                return None
+            finally:
+                bucket.in_flight -= 1
+
+            bucket.uploads += 1
+            return message["attachments"][0]["url"]
+
+        _log.warning(f"Webhook upload of {filename} kept getting rate limited")
+        return None